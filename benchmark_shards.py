@@ -0,0 +1,113 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+
+from hangman_client import run_headless
+
+# Seconds to wait for the router and all of its shards to answer
+STARTUP_TIMEOUT = 60
+
+
+async def wait_until_ready(api_url: str):
+    """
+    Polls the router's /shards until every shard answers.
+
+    Raises:
+        TimeoutError: If the shards are not up within STARTUP_TIMEOUT seconds.
+    """
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(f"{api_url}/shards") as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"{api_url} did not come up within {STARTUP_TIMEOUT}s")
+
+
+def run_client(script: str | None, players: int, lobby_size: int, api_url: str, poll_interval: float,
+               via_router: bool) -> dict:
+    """Runs one headless client process, see hangman_client.run_headless."""
+    return asyncio.run(run_headless(script, players, lobby_size, api_url, poll_interval, via_router=via_router))
+
+
+def measure(shards: int, args) -> dict:
+    """
+    Starts router.py with `shards` shards and drives it with headless client processes.
+
+    Every client process runs its share of the players on its own event loop, so the
+    clients do not become the bottleneck before the shards do.
+
+    Returns:
+        dict: The number of shards, requests, failed lobbies and elapsed seconds, the
+        requests per second and the mean and 99th percentile latency in milliseconds.
+    """
+    api_url = f"http://{args.host}:{args.port}"
+    env = dict(os.environ, HANGMAN_RATE_LIMIT_EXEMPT="127.0.0.1,::1")
+    router = subprocess.Popen(
+        [sys.executable, "router.py", "--shards", str(shards), "--host", args.host,
+         "--port", str(args.port), "--base-port", str(args.port + 1)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        asyncio.run(wait_until_ready(api_url))
+        share = args.players // args.clients
+        start = time.perf_counter()
+        with ProcessPoolExecutor(args.clients) as pool:
+            summaries = list(pool.map(
+                run_client, *zip(*[(args.script, share, args.lobby_size, api_url, args.poll_interval,
+                                    args.via_router)] * args.clients)))
+        elapsed = time.perf_counter() - start
+    finally:
+        # The router stops its shards on SIGTERM
+        router.terminate()
+        router.wait()
+
+    latencies = sorted(latency for summary in summaries for latency in summary["latencies"])
+    return {
+        "shards": shards,
+        "requests": len(latencies),
+        "failed": sum(len(summary["errors"]) for summary in summaries),
+        "elapsed": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "mean_ms": sum(latencies) / len(latencies) * 1e3 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3 if latencies else 0.0,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Measures how headless game throughput scales with the shard count")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4], help="Shard counts to measure")
+    parser.add_argument("--script", help="JSONL script of the headless players, see hangman_client.load_script")
+    parser.add_argument("--players", type=int, default=400, help="Simulated players per run")
+    parser.add_argument("--lobby-size", type=int, default=4, help="Players per lobby")
+    parser.add_argument("--clients", type=int, default=4, help="Client processes sharing the players")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Seconds between status polls")
+    parser.add_argument("--via-router", action="store_true",
+                        help="Send every request through the router instead of straight to the owning shards")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface of the router and the shards")
+    parser.add_argument("--port", type=int, default=8100, help="Port of the router, the shards use the next ones")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(f"CPUs: {os.cpu_count()}, players: {args.players}, client processes: {args.clients}, "
+          f"{'via the router' if args.via_router else 'direct to the shards'}")
+    print(f"{'shards':>6} {'requests':>9} {'req/s':>8} {'speedup':>8} {'mean ms':>8} {'p99 ms':>8} {'failed':>7}")
+    baseline = None
+    for shards in args.shards:
+        result = measure(shards, args)
+        baseline = baseline or result["requests_per_second"]
+        print(f"{result['shards']:>6} {result['requests']:>9} {result['requests_per_second']:>8.0f} "
+              f"{result['requests_per_second'] / baseline:>7.2f}x {result['mean_ms']:>8.1f} "
+              f"{result['p99_ms']:>8.1f} {result['failed']:>7}")
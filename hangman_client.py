@@ -1,290 +1,603 @@
+import argparse
 import asyncio
 import json
 import sys
-from time import sleep
+import time
+from itertools import cycle
+from uuid import uuid4
 
-import requests
-import websockets
+import aiohttp
 from rich import print
 
+from utils.hash_ring import HashRing
+
 API_URL = "http://localhost:8000"  # Replace with your FastAPI server URL
 
-user_name = ""
-user_id = ""
-server_id = ""
-game_id = ""
+# Statuses of a refused guess the player can recover from by guessing again, e.g. after
+# a typo like "ab" (400) or an empty input that does not match the route (404, 405)
+RETRY_GUESS_STATUSES = (400, 404, 405)
 
-# Function to create a new player
+# Letters tried by headless players once their scripted guesses run out
+FALLBACK_GUESSES = "enisratdhulcgmobwfkzpvjyxqäöüß"
 
 
-def create_player():
-    """
-    Create a new player by prompting for the name and sending a POST request to the server.
+class ClientError(Exception):
+    """Raised when the server answers a request with an unexpected status code."""
 
-    The created player's name and ID are stored in the global variables 'user_name' and 'user_id'.
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"{status}: {detail}")
+        self.status = status
+        self.detail = detail
 
-    Raises:
-        - None
 
-    Returns:
-        - None
+class ShardMap:
     """
-    global user_name, user_id
-    name = input("Enter your name: ")
-    player = {"name": name}
-    response = requests.post(f"{API_URL}/create_player", json=player)
-    if response.status_code == 200:
-        player_data = response.json()
-        user_name = player_data["name"]
-        user_id = player_data["id"]
-        print("[bold green]Player created successfully![/bold green]")
-        print(f"[bold]Player ID:[/bold] {user_id}")
-    else:
-        print("[bold red]Failed to create player.[/bold red]")
+    Sends the requests about a lobby, game or player straight to the shard that owns it.
 
+    Going through router.py costs every request a second hop and makes the router the
+    limit of the whole deployment. The map is read once from GET /shard_map, and IDs are
+    hashed on the same ring as on the router and the shards. Shards redirect requests
+    for IDs they no longer own, so a map that went stale after a rebalance still works.
+    A redirect makes the client fetch the map again, so its WebSockets reach the new owner too.
+    A server that is not sharded returns an empty map and gets every request.
 
-def create_or_join_lobby():
+    Args:
+        api_url (str): Base URL of the router or server.
+        shards (dict): Maps every shard name to its URL.
     """
-    Prompt the user to create a new lobby or join an existing lobby based on their choice.
-
-    The user's choice is obtained from the input. If the choice is 'C', the function calls the
-    'create_new_lobby' function. If the choice is 'J', the function calls the 'join_existing_lobby' function.
-    If the choice is neither 'C' nor 'J', an error message is displayed.
 
-    Raises:
-        - None
-
-    Returns:
-        - None
+    def __init__(self, api_url: str, shards: dict):
+        self.api_url = api_url
+        self.shards = shards
+        self.ring = HashRing(shards)
+
+    @classmethod
+    async def fetch(cls, session: aiohttp.ClientSession, api_url: str) -> "ShardMap":
+        """
+        Returns:
+            ShardMap: The shard map of the router or server at `api_url`, empty if it has none.
+        """
+        shard_map = cls(api_url, {})
+        await shard_map.refresh(session)
+        return shard_map
+
+    async def refresh(self, session: aiohttp.ClientSession):
+        """Reads the shard map again, e.g. after a shard was added."""
+        async with session.get(f"{self.api_url}/shard_map") as response:
+            self.shards = await response.json() if response.status == 200 else {}
+        self.ring = HashRing(self.shards)
+
+    def url_for(self, key: str) -> str:
+        """
+        Returns:
+            str: The base URL of the shard owning the ID, or the API URL if there are no shards.
+        """
+        return self.shards[self.ring.get_node(key)] if self.shards else self.api_url
+
+
+class HangmanClient:
     """
-    global server_id
-    choice = input("Create new lobby (C) or join existing lobby (J)? ")
-    if choice.upper() == "C":
-        create_new_lobby()
-    elif choice.upper() == "J":
-        join_existing_lobby()
-    else:
-        print("[bold red]Invalid choice. Please try again.[/bold red]")
+    One hangman player talking to the server.
 
+    All clients of a process share one aiohttp session, so HTTP connections are pooled
+    and reused instead of opened per call. Each client keeps one WebSocket open to the
+    lobby it joined for the whole game. An open WebSocket holds its connection for good,
+    so WebSockets can be opened on a separate session to keep them out of the HTTP pool.
 
+    Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
+        api_url (str): Base URL of the server.
+        poll_interval (float): Seconds between two status polls while waiting for a turn.
+        ws_session (aiohttp.ClientSession, optional): The session for WebSockets. Defaults to `session`.
+        shard_map (ShardMap, optional): Routes requests to the owning shards. Without it,
+            every request goes to `api_url`.
+    """
 
-# Function to create a new lobby
-def create_new_lobby():
+    def __init__(self, session: aiohttp.ClientSession, api_url: str = API_URL, poll_interval: float = 1.0,
+                 ws_session: aiohttp.ClientSession | None = None, shard_map: ShardMap | None = None):
+        self.session = session
+        self.ws_session = ws_session or session
+        self.api_url = api_url
+        self.shard_map = shard_map
+        self.poll_interval = poll_interval
+
+        self.user_name = ""
+        self.user_id = ""
+        self.server_id = ""
+        self.game_id = ""
+        self.ws = None
+        self.keepalive = None
+
+        self.latencies = []
+
+    def base_url(self, key: str | None = None) -> str:
+        """
+        Returns:
+            str: The base URL to send requests about a lobby, game or player ID to.
+        """
+        return self.shard_map.url_for(key) if self.shard_map and key else self.api_url
+
+    async def request(self, method: str, path: str, key: str | None = None, **kwargs) -> dict:
+        """
+        Sends a request to the server and returns the JSON response.
+
+        Requests rejected with 429 or 503 are retried after the Retry-After delay.
+        A request that was redirected to another shard refreshes the shard map.
+
+        Args:
+            method (str): HTTP method.
+            path (str): Path relative to the API URL.
+            key (str, optional): The lobby, game or player ID the request is about, which
+                decides the shard it is sent to.
+            **kwargs: Passed on to aiohttp.
+
+        Returns:
+            dict: The parsed JSON response.
+
+        Raises:
+            ClientError: If the server answers with any other non-200 status code.
+        """
+        while True:
+            start = time.perf_counter()
+            async with self.session.request(method, f"{self.base_url(key)}{path}", **kwargs) as response:
+                data = await response.json(content_type=None)
+            self.latencies.append(time.perf_counter() - start)
+            if response.history and self.shard_map:
+                await self.shard_map.refresh(self.session)
+
+            if response.status in (429, 503):
+                await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+                continue
+            if response.status != 200:
+                detail = data.get("detail", "") if isinstance(data, dict) else str(data)
+                raise ClientError(response.status, detail)
+            return data
+
+    async def create_player(self, name: str):
+        """
+        Creates a new player and stores its name and ID on the client.
+
+        Args:
+            name (str): The player name.
+        """
+        # The ID is chosen here, so the request can go to the shard that owns it
+        player_id = uuid4().hex
+        player_data = await self.request("POST", "/create_player", player_id, json={"id": player_id, "name": name})
+        self.user_name = player_data["name"]
+        self.user_id = player_data["id"]
+
+    async def create_lobby(self, max_players: int) -> str:
+        """
+        Creates a new lobby.
+
+        Args:
+            max_players (int): The maximum number of players in the lobby.
+
+        Returns:
+            str: The ID of the created lobby.
+        """
+        lobby_id = uuid4().hex
+        lobby_data = await self.request(
+            "POST", "/create_lobby", lobby_id, json={"id": lobby_id, "maxPlayers": max_players})
+        return lobby_data["id"]
+
+    async def connect(self, lobby_id: str):
+        """
+        Opens the WebSocket to the multicast channel of a lobby.
+
+        Args:
+            lobby_id (str): The ID of the lobby.
+        """
+        ws_url = self.base_url(lobby_id).replace("http", "ws", 1)
+        self.ws = await self.ws_session.ws_connect(f"{ws_url}/multicast/{lobby_id}")
+
+    async def join_lobby(self, lobby_id: str) -> dict:
+        """
+        Joins a lobby.
+
+        Args:
+            lobby_id (str): The ID of the lobby to join.
+
+        Returns:
+            dict: The lobby data after joining.
+
+        Raises:
+            ClientError: If the lobby is closed (403) or the lobby or player is not found (404).
+        """
+        lobby_data = await self.request("POST", f"/lobby/{lobby_id}/join/{self.user_id}", lobby_id)
+        self.server_id = lobby_data["id"]
+        return lobby_data
+
+    async def wait_for_game(self, on_message=None) -> str:
+        """
+        Reads WebSocket messages until the server reports that the game started.
+
+        Args:
+            on_message (callable, optional): Called with the text of every chat message.
+
+        Returns:
+            str: The ID of the started game.
+
+        Raises:
+            ValueError: If the "game_id" field is missing when the status is "done".
+            ConnectionError: If the lobby expired or the WebSocket closed before the game started.
+        """
+        async for message in self.ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            json_data = json.loads(message.data)
+            if json_data.get("type") == "ping":
+                await self.ws.send_json({"type": "pong"})
+                continue
+            if "message" in json_data and on_message:
+                on_message(json_data["message"])
+            if json_data.get("event") == "lobby.expired":
+                raise ConnectionError("The lobby expired before it filled up")
+            if json_data.get("status") == "done":
+                if "game_id" not in json_data:
+                    raise ValueError("Game ID not found in the JSON data")
+                self.game_id = json_data["game_id"]
+                self.keepalive = asyncio.create_task(self.answer_pings())
+                return self.game_id
+        raise ConnectionError("WebSocket closed before the game started")
+
+    async def answer_pings(self):
+        """Keeps the WebSocket alive during the game by answering server heartbeats."""
+        async for message in self.ws:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                break
+            if json.loads(message.data).get("type") == "ping":
+                await self.ws.send_json({"type": "pong"})
+
+    async def get_player_status(self) -> dict:
+        """
+        Returns:
+            dict: The ID of the player whose turn it is and the word status.
+        """
+        return await self.request("GET", f"/status/{self.game_id}", self.game_id)
+
+    async def guess(self, char: str) -> dict:
+        """
+        Guesses a character in the current game.
+
+        Args:
+            char (str): The character to guess.
+
+        Returns:
+            dict: The server response.
+        """
+        return await self.request("POST", f"/guess/{self.game_id}/{self.user_id}/{char}", self.game_id)
+
+    async def close(self):
+        """Closes the WebSocket, if open."""
+        if self.keepalive is not None:
+            self.keepalive.cancel()
+            self.keepalive = None
+        if self.ws is not None:
+            await self.ws.close()
+            self.ws = None
+
+
+async def make_guess(client: HangmanClient, next_char, on_guess=None, on_error=None) -> dict:
     """
-    Create a new lobby by sending a request to the API with the specified maximum number of players.
+    Plays the current game until it ends for this player.
 
-    The function prompts the user to enter the maximum number of players for the lobby. It sends a POST
-    request to the API URL with the provided maximum number of players in the request payload. If the
-    response status code is 200, indicating a successful creation of the lobby, the function retrieves
-    the lobby data from the response and sets the 'server_id' variable to the lobby ID. It then displays
-    a success message along with the lobby ID and calls the 'join_existing_lobby' function to join the
-    newly created lobby. If the response status code is not 200, an error message is displayed.
+    Polls the status until it is the player's turn, asks `next_char` for a character
+    and sends it. The game ends for the player when the word is complete, the player
+    has run out of lives, or the game can no longer be found. A refused guess, such as
+    an invalid character, is reported and the player guesses again.
 
-    Raises:
-        - None
+    Args:
+        client (HangmanClient): The player.
+        next_char (callable): Coroutine function taking the word status and returning the
+            character to guess, or None to give up.
+        on_guess (callable, optional): Called with the response of every guess that did not end the game.
+        on_error (callable, optional): Called with the detail of every guess the server refused.
 
     Returns:
-        - None
+        dict: The last response, with "won" set to True if this player guessed the word.
     """
-    global server_id
-    max_players = int(input("Enter the maximum number of players: "))
-    lobby = {"maxPlayers": max_players}
-    response = requests.post(f"{API_URL}/create_lobby", json=lobby)
-    if response.status_code == 200:
-        lobby_data = response.json()
-        server_id = lobby_data["id"]
-        print("[bold green]Lobby created successfully![/bold green]")
-        print(f"[bold]Lobby ID:[/bold] {server_id}")
-        join_existing_lobby(lobby_id=server_id)
-    else:
-        print("[bold red]Failed to create lobby.[/bold red]")
+    while True:
+        try:
+            player_status = await client.get_player_status()
+        except ClientError as e:
+            return {"won": False, "detail": e.detail}
+        word_status = player_status.get("word_status", "")
+        if "-" not in word_status:
+            return {"won": False, "word_status": word_status}
 
+        if player_status.get("player_status") != client.user_id:
+            await asyncio.sleep(client.poll_interval)
+            continue
 
+        char = await next_char(word_status)
+        if char is None:
+            return {"won": False, "word_status": word_status}
 
-# Function to join an existing lobby
-def join_existing_lobby(lobby_id=None):
-    """
-    Join an existing lobby by sending a request to the API with the provided lobby ID.
+        try:
+            data = await client.guess(char)
+        except ClientError as e:
+            if e.status not in RETRY_GUESS_STATUSES:
+                return {"won": False, "detail": e.detail}
+            # The status poll ends the game if it is over, otherwise the player tries again
+            if on_error and "not your turn" not in e.detail:
+                on_error(e.detail)
+            continue
 
-    The function prompts the user to enter the lobby ID if it is not provided as an argument. It sends
-    a POST request to the API URL with the lobby ID and the user ID in the request URL. If the response
-    status code is 200, indicating a successful join, the function retrieves the lobby data from the response,
-    sets the 'server_id' variable to the lobby ID, and displays a success message along with the lobby ID and
-    the current players in the lobby. It then calls the 'start_websocket_listener' function to listen for
-    incoming WebSocket messages in the joined lobby. If the response status code is not 200, the function
-    handles different error scenarios based on the response status code, displays an appropriate error message,
-    and exits the program if necessary.
+        data["won"] = "Congratulations" in data.get("detail", "")
+        if data["won"] or data.get("lives") == 0:
+            return data
+        if on_guess:
+            on_guess(data)
 
-    Args:
-        lobby_id (str, optional): The ID of the lobby to join. If not provided, the user is prompted to enter it.
 
-    Raises:
-        - None
+# Interactive mode
 
-    Returns:
-        - None
+
+async def ask(prompt: str) -> str:
+    """Reads a line from stdin without blocking the event loop."""
+    return await asyncio.to_thread(input, prompt)
+
+
+async def play_game(api_url: str = API_URL):
     """
-    global server_id, user_id
-    if lobby_id is None:
-        lobby_id = input("Enter the lobby ID: ")
-    response = requests.post(f"{API_URL}/lobby/{lobby_id}/join/{user_id}")
-    if response.status_code == 200:
-        lobby_data = response.json()
-        server_id = lobby_data["id"]
+    Plays one interactive game: create a player, create or join a lobby, then guess.
+    """
+    async with aiohttp.ClientSession() as session:
+        client = HangmanClient(session, api_url, shard_map=await ShardMap.fetch(session, api_url))
+
+        await client.create_player(await ask("Enter your name: "))
+        print("[bold green]Player created successfully![/bold green]")
+        print(f"[bold]Player ID:[/bold] {client.user_id}")
+
+        choice = (await ask("Create new lobby (C) or join existing lobby (J)? ")).upper()
+        if choice == "C":
+            max_players = int(await ask("Enter the maximum number of players: "))
+            lobby_id = await client.create_lobby(max_players)
+            print("[bold green]Lobby created successfully![/bold green]")
+            print(f"[bold]Lobby ID:[/bold] {lobby_id}")
+        elif choice == "J":
+            lobby_id = await ask("Enter the lobby ID: ")
+        else:
+            print("[bold red]Invalid choice. Please try again.[/bold red]")
+            return
+
+        try:
+            lobby_data = await client.join_lobby(lobby_id)
+        except ClientError as e:
+            messages = {
+                403: "Lobby is closed. Cannot join.",
+                404: "Lobby or player not found.",
+                409: "Lobby is full. Cannot join.",
+            }
+            print(f"[bold red]{messages.get(e.status, 'Failed to join lobby.')}[/bold red]")
+            sys.exit()
+
         print("[bold green]Successfully joined the lobby![/bold green]")
-        print(f"[bold]Lobby ID:[/bold] {server_id}")
+        print(f"[bold]Lobby ID:[/bold] {client.server_id}")
         print("[bold]Current Players:[/bold]")
         for player in lobby_data["players"]:
             print(player["name"])
-        start_websocket_listener(lobby_id=server_id)
-    elif response.status_code == 403:
-        print("[bold red]Lobby is closed. Cannot join.[/bold red]")
-        sys.exit()
-    elif response.status_code == 404:
-        print("[bold red]Lobby or player not found.[/bold red]")
-        sys.exit()
-    elif response.status_code == 409:
-        print("[bold red]Lobby is full. Cannot join.[/bold red]")
-        sys.exit()
-    else:
-        print("[bold red]Failed to join lobby.[/bold red]")
-        sys.exit()
+
+        await client.connect(client.server_id)
+        try:
+            await client.wait_for_game(
+                on_message=lambda message: print(f"[bold green] {message} [/bold green]"))
+        except ConnectionError as e:
+            print(f"[bold red]{e}[/bold red]")
+            await client.close()
+            return
+        print("GameID", client.game_id)
+
+        async def next_char(word_status):
+            print(word_status)
+            return await ask("Make Guess: ")
+
+        def on_guess(data):
+            lives = data.get("lives")
+            print(lives if lives else "", "lives")
+            if data.get("hangman"):
+                print(data.get("hangman"))
+
+        def on_error(detail):
+            print(f"[bold red]Request failed: {detail}[/bold red]")
+
+        result = await make_guess(client, next_char, on_guess, on_error)
+        if result.get("won"):
+            print(result.get("detail"))
+            print("word", result.get("word_status"))
+        elif result.get("lives") == 0:
+            print("You have run out of lives")
+        else:
+            print(result.get("detail") or f"Game over: {result.get('word_status')}")
+
+        await client.close()
 
 
-# Function to handle incoming WebSocket messages
-async def handle_websocket_messages(lobby_id):
+# Headless mode
+
+
+def load_script(path: str) -> list:
     """
-    Handle incoming WebSocket messages in the specified lobby.
+    Loads scripted players from a JSONL file.
 
-    The function establishes a WebSocket connection to the server's multicast endpoint using the provided
-    lobby ID. It sends the user ID to the server after the connection is established. The function then enters
-    a loop to receive and process incoming messages. Each received message is parsed as JSON, and if it contains
-    a "message" field, it is printed as a formatted green message. If the message contains a "status" field with
-    the value "done", the function checks if the "game_id" field is present in the JSON data. If not, a ValueError
-    is raised. Otherwise, the value of "game_id" is assigned to the global variable 'game_id', and the loop is exited.
+    Each line is a JSON object with an optional "name" and a "guesses" string or list.
+    Lines without "guesses" (for example a backlog like requests.jsonl) still give a
+    player that only uses the fallback letters.
 
     Args:
-        lobby_id (str): The ID of the lobby to handle WebSocket messages for.
-
-    Raises:
-        ValueError: If the "game_id" field is missing in the JSON data when the status is "done".
+        path (str): Path to the JSONL file.
 
     Returns:
-        - None
+        list: One dict per non-empty line with "name" and "guesses".
+
+    Example:
+        {"name": "alice", "guesses": "eai"}
+        {"name": "bob", "guesses": ["n", "s", "r"]}
     """
-    global game_id
-    async with websockets.connect(f"ws://localhost:8000/multicast/{lobby_id}") as ws:
-        await ws.send(user_id)  # Send the user ID to the server
-        running = True
-        while running:
-            data = await ws.recv()
-            json_data = json.loads(data)
-            # print(f"[bold green] {json_data} [/bold green]")
-            if "message" in json_data:
-                print(f"[bold green] {json_data['message']} [/bold green]")
-            if "status" in json_data and json_data["status"] == "done":
-                if "game_id" not in json_data:
-                    raise ValueError("Game ID not found in the JSON data")
-                game_id = json_data["game_id"]
-                running = False
+    script = []
+    with open(path, "r") as file:
+        for number, line in enumerate(file):
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            script.append({
+                "name": str(entry.get("name") or entry.get("request_id") or f"player-{number}"),
+                "guesses": list(entry.get("guesses", [])),
+            })
+    return script
+
+
+async def play_headless(client: HangmanClient, guesses: list) -> dict:
+    """
+    Plays the current game with scripted guesses, then the fallback letters.
 
-            sleep(1)
+    Args:
+        client (HangmanClient): A player whose game has started.
+        guesses (list): The scripted characters, in order.
 
+    Returns:
+        dict: The last response of the game for this player.
+    """
+    queue = iter(list(guesses) + list(FALLBACK_GUESSES))
+    tried = set()
 
+    async def next_char(word_status):
+        for char in queue:
+            if char not in tried and char not in word_status:
+                tried.add(char)
+                return char
+        return None
 
-# Function to start the WebSocket listener
-def start_websocket_listener(lobby_id):
-    loop = asyncio.get_event_loop()
-    loop.run_until_complete(handle_websocket_messages(lobby_id))
+    return await make_guess(client, next_char)
 
 
-def get_player_status():
+async def run_lobby(session: aiohttp.ClientSession, ws_session: aiohttp.ClientSession, api_url: str,
+                    entries: list, poll_interval: float, shard_map: ShardMap | None = None) -> list:
     """
-    Retrieve the status of the player in the hangman game.
+    Runs one lobby of scripted players from creation to the end of the game.
+
+    The server starts the game when the last player joins and the lobby is full, and
+    sends its ID over the lobby WebSocket, also to clients that connect afterwards.
 
-    The function sends a GET request to the server's status API endpoint to retrieve the current status of the player
-    in the hangman game. It expects the `game_id` to be defined and available in the scope where this function is called.
-    If the GET request returns a status code of 200, indicating a successful response, the response data is parsed as JSON
-    and returned. Otherwise, an appropriate error message is printed, and None is returned.
+    Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
+        ws_session (aiohttp.ClientSession): The shared WebSocket session.
+        api_url (str): Base URL of the server.
+        entries (list): Scripted players of this lobby.
+        poll_interval (float): Seconds between two status polls.
+        shard_map (ShardMap, optional): Routes the players' requests to the owning shards.
 
     Returns:
-        dict or None: A dictionary containing the player's status information if available, or None if the request fails
-                     or the status code is not 200.
+        list: The results of the players.
     """
+    clients = [HangmanClient(session, api_url, poll_interval, ws_session, shard_map) for _ in entries]
     try:
-        response = requests.get(f"{API_URL}/status/{game_id}")
-        response.raise_for_status()  # Raise an exception for non-200 status codes
-        resp_json = response.json()
-        return resp_json
-    except requests.exceptions.RequestException as e:
-        print(f"Request failed: {e}")
-    except ValueError as e:
-        print(f"Failed to parse response data: {e}")
-    return None
+        await asyncio.gather(*(
+            client.create_player(entry["name"]) for client, entry in zip(clients, entries)))
+        lobby_id = await clients[0].create_lobby(len(clients))
 
+        await asyncio.gather(*(client.connect(lobby_id) for client in clients))
+        for client in clients:
+            await client.join_lobby(lobby_id)
 
+        await asyncio.gather(*(client.wait_for_game() for client in clients))
 
-def make_guess(game_id, user_id):
+        results = await asyncio.gather(*(
+            play_headless(client, entry["guesses"]) for client, entry in zip(clients, entries)))
+        for client, result in zip(clients, results):
+            result["latencies"] = client.latencies
+        return results
+    finally:
+        await asyncio.gather(*(client.close() for client in clients))
+
+
+async def run_headless(script_path: str | None, players: int, lobby_size: int, api_url: str = API_URL,
+                       poll_interval: float = 0.2, connections: int = 100, via_router: bool = False) -> dict:
     """
-    Perform a guessing action in the hangman game.
-
-    The function allows the user to make guesses in the hangman game identified by the provided game ID and user ID.
-    It repeatedly prompts the user to enter a character for their guess until the game ends. The function retrieves
-    the player status using the `get_player_status` function and checks if it's the user's turn to guess. If so,
-    the current word status is displayed, and the user is prompted to enter a character as their guess. The guess
-    is sent to the server via a POST request to the guess API endpoint. If the response has a status code of 200,
-    the response data is parsed as JSON. The remaining lives of the player and the hangman visual representation
-    (if present) are printed. If the player has run out of lives (lives = 0), a corresponding message is printed,
-    and the loop is exited. If the response data contains a "Congratulations" message, indicating that the guess
-    was correct and the game is won, the victory message and the final word status are printed, and the loop is
-    exited. Otherwise, if the guess is incorrect, the loop continues. If the response status code is not 200, an
-    error message is printed.
+    Drives many simulated players concurrently from one event loop.
 
     Args:
-        game_id (str): The ID of the hangman game.
-        user_id (str): The ID of the player making the guess.
+        script_path (str | None): JSONL file with the scripted players, reused in a cycle.
+            Without it, players only guess the fallback letters.
+        players (int): Number of simulated players.
+        lobby_size (int): Players per lobby.
+        api_url (str): Base URL of the server or router.
+        poll_interval (float): Seconds between two status polls.
+        connections (int): Size of the HTTP connection pool.
+        via_router (bool): Send every request through `api_url` instead of straight to
+            the shards listed by its /shard_map.
 
     Returns:
-        None
+        dict: The numbers of players, lobbies, finished players and wins, the failed
+        lobbies' errors, the elapsed seconds and the sorted request latencies.
     """
-    running = True
-    while running:
-        player_status = get_player_status()
-        if player_status.get("player_status") == user_id:
-            current_word_status = player_status.get("word_status")
-            print(current_word_status)
-            char = input("Make Guess: ")
-            GUESS_API_ENDPOINT = f"{API_URL}/guess/{game_id}/{user_id}/{char}"
-            response = requests.post(GUESS_API_ENDPOINT)
-            if response.status_code == 200:
-                data = response.json()
-                lives = data.get("lives")
-                print(lives if lives else "", "lives")
-                if lives == 0:
-                    print("You have run out of lives")
-                    running = False
-
-                if data.get("hangman"):
-                    print(data.get("hangman"))
-                if "Congratulations" in data.get("detail", ""):
-                    print(data.get('detail'))
-                    print("word", data.get("word_status"))
-                    running = False  # Break out of the loop if guess is correct
-
-            else:
-                print(f"Request failed: {response.text}")
-        else:
-            ...
-        sleep(1)
-
-
-# Main game loop
-def play_game():
-    create_player()
-    create_or_join_lobby()
-    print("GameID", game_id)
-    make_guess(game_id, user_id)
+    script = (load_script(script_path) if script_path else []) or [{"name": "player", "guesses": []}]
+    entries = [dict(entry) for entry, _ in zip(cycle(script), range(players))]
+    lobbies = [entries[i:i + lobby_size] for i in range(0, len(entries), lobby_size)]
+
+    # Every player keeps a WebSocket open, so they get an unbounded pool of their own.
+    # Sharing the bounded HTTP pool would deadlock once there are more players than connections.
+    connector = aiohttp.TCPConnector(limit=connections)
+    start = time.perf_counter()
+    async with aiohttp.ClientSession(connector=connector) as session, \
+            aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0)) as ws_session:
+        shard_map = None if via_router else await ShardMap.fetch(session, api_url)
+        results = await asyncio.gather(
+            *(run_lobby(session, ws_session, api_url, lobby, poll_interval, shard_map) for lobby in lobbies),
+            return_exceptions=True,
+        )
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if isinstance(result, BaseException)]
+    finished = [player for result in results if not isinstance(result, BaseException) for player in result]
+    return {
+        "players": players,
+        "lobbies": len(lobbies),
+        "finished": len(finished),
+        "wins": sum(1 for result in finished if result.get("won")),
+        "errors": [repr(error) for error in failed],
+        "elapsed": elapsed,
+        "latencies": sorted(latency for result in finished for latency in result["latencies"]),
+    }
+
+
+def print_summary(summary: dict):
+    """Prints the result of run_headless."""
+    latencies = summary["latencies"]
+    elapsed = summary["elapsed"]
+    print(f"[bold]Players:[/bold] {summary['players']} in {summary['lobbies']} lobbies")
+    print(f"[bold]Finished:[/bold] {summary['finished']}, wins: {summary['wins']}, "
+          f"failed lobbies: {len(summary['errors'])}")
+    print(f"[bold]Elapsed:[/bold] {elapsed:.2f}s")
+    if latencies:
+        print(f"[bold]Requests:[/bold] {len(latencies)} ({len(latencies) / elapsed:.0f}/s), "
+              f"mean latency {sum(latencies) / len(latencies) * 1000:.1f}ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms")
+    for error in summary["errors"][:5]:
+        print(f"[bold red]{error}[/bold red]")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Hangman game client")
+    parser.add_argument("--url", default=API_URL, help="Base URL of the server")
+    parser.add_argument("--headless", metavar="SCRIPT",
+                        help="Run simulated players with scripted guesses from a JSONL file")
+    parser.add_argument("--players", type=int, default=2, help="Number of simulated players")
+    parser.add_argument("--lobby-size", type=int, default=2, help="Players per lobby")
+    parser.add_argument("--poll-interval", type=float, default=0.2,
+                        help="Seconds between status polls in headless mode")
+    parser.add_argument("--connections", type=int, default=100, help="HTTP connection pool size")
+    parser.add_argument("--via-router", action="store_true",
+                        help="Send headless requests through --url instead of straight to the owning shards")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    play_game()
+    args = parse_args()
+    if args.headless:
+        print_summary(asyncio.run(run_headless(
+            args.headless, args.players, args.lobby_size, args.url, args.poll_interval, args.connections,
+            args.via_router)))
+    else:
+        asyncio.run(play_game(args.url))
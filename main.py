@@ -1,23 +1,458 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-
+import asyncio
+import json
+import math
+import os
+import secrets
+import time
+from collections import defaultdict
+from datetime import datetime
+from uuid import uuid4
+
+import aiohttp
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import ValidationError
+
+from models.event_models import (GameFinishedEvent, GameStartedEvent, GuessEvent, LobbyCreatedEvent,
+                                 LobbyExpiredEvent, LobbyFullEvent, PlayerEliminatedEvent,
+                                 PlayerJoinedEvent)
 from models.game_models import GameModel, LobbyModel, PlayerModel
+from utils.archive import GameArchive
 from utils.db_helpers import get_game_by_id, get_lobby_by_id, get_player_by_id
-from utils.game_helpers import find_all_occurrences, replace_char_at_indices
+from utils.event_bus import ALL_TOPICS, EventBus
+from utils.game_engine import CORRECT, ELIMINATED, WON, GameRuleError, GameState
 from utils.hangman_drawer import show_hangman
-from utils.io_helpers import get_random_word
+from utils.hash_ring import HashRing
+from utils.heartbeat import HeartbeatMonitor
+from utils.io_helpers import get_random_word, iter_ndjson_lines
+from utils.leaderboard import Leaderboard
+from utils.memory import AllocationTracker, estimate_collection
+from utils.rate_limit import LoadMonitor, RateLimiter
+from utils.solver import BotPlayer, HangmanSolver
+from utils.sse import EventStream
+from utils.topics import TopicRegistry, game_topic, lobby_topic, parse_topic
 
 # Main Fastapi instance
 app = FastAPI()
 
+
+def env_float(name: str, default: float) -> float:
+    """
+    Returns:
+        float: The value of an environment variable, or `default` if it is unset.
+    """
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+# Sharding: when run behind router.py, HANGMAN_SHARD names this worker and HANGMAN_SHARDS
+# maps every shard name to its URL. Lobbies, games and players belong to the shard their ID
+# hashes to on the ring. A shard also keeps copies of the players who joined its lobbies.
+# Unset, this process owns everything.
+SHARD_NAME = os.environ.get("HANGMAN_SHARD")
+shard_urls = json.loads(os.environ.get("HANGMAN_SHARDS", "{}"))
+hash_ring = HashRing(shard_urls)
+if shard_urls and SHARD_NAME not in shard_urls:
+    raise RuntimeError(f"HANGMAN_SHARD must be one of {', '.join(shard_urls)}, got {SHARD_NAME!r}")
+# Shared by the router and the shards. Only requests carrying it in X-Shard-Secret may use
+# the /internal endpoints or have their X-Forwarded-For client address trusted.
+SHARD_SECRET = os.environ.get("HANGMAN_SHARD_SECRET")
+# Pooled connections of a shard to the other shards, opened on startup
+shard_session: aiohttp.ClientSession | None = None
+
 # For simplicity, we use in-memory data structures instead of a database
 lobbies = []
 players = []
+# Maps player_id -> the PlayerModel in `players`, so lookups do not scan the list
+players_by_id = {}
 games = []
+# Maps game_id -> the GameState that applies the rules and tracks lives for that game
 game_sessions = {}
 
 # Maintain a dictionary of active WebSocket connections
 ws_connections = {}
 
+# Subscriptions of the multiplexed /ws connections to "lobby:<id>" and "game:<id>" topics
+MUX_MAX_TOPICS = 1000
+topic_subscriptions = TopicRegistry(MUX_MAX_TOPICS)
+
+# Game events are published on the bus; WebSocket channels, stats, the archive
+# and bots subscribe to them at the bottom of this module.
+event_bus = EventBus()
+event_counts = {}
+
+# Maps a lobby ID to the ID of the game started for it, so each lobby starts one game
+lobby_games = {}
+
+# Lobby browsers follow lobby changes over Server-Sent Events. Open lobbies that do
+# not fill up within LOBBY_TTL seconds expire, checked every LOBBY_EXPIRY_INTERVAL seconds.
+lobby_stream = EventStream(lambda: [lobby.dict() for lobby in lobbies])
+LOBBY_TTL = 600
+LOBBY_EXPIRY_INTERVAL = 60
+
+# Keep references to long-running background tasks so they are not garbage collected
+background_tasks = set()
+
+# On-demand tracemalloc snapshots for the memory admin endpoints
+allocation_tracker = AllocationTracker()
+
+# Heartbeat settings in seconds: ping interval, silence before eviction, and
+# time without a non-heartbeat message before a live connection counts as idle
+HEARTBEAT_INTERVAL = 10
+HEARTBEAT_TIMEOUT = 30
+HEARTBEAT_IDLE_AFTER = 60
+
+# Seconds a single WebSocket send may take before the connection is evicted as stalled.
+# Event fan-out is awaited by the HTTP handlers, so this bounds what one slow client costs them.
+SEND_TIMEOUT = 1.0
+
+# Finished games are moved out of `games` into a compact columnar archive. New games are
+# appended to ARCHIVE_PATH every ARCHIVE_FLUSH_GAMES games or ARCHIVE_FLUSH_INTERVAL seconds,
+# so a crash loses at most those; the file is compacted on shutdown and memory-mapped on startup.
+ARCHIVE_PATH = f"games.{SHARD_NAME}.archive" if SHARD_NAME else "games.archive"
+ARCHIVE_FLUSH_GAMES = 1000
+ARCHIVE_FLUSH_INTERVAL = 10
+archive = GameArchive()
+
+# Per-player statistics and ranking, updated as guesses are made and games end
+leaderboard = Leaderboard()
+
+# Per-IP and per-player token buckets, kept in bounded LRUs. Player buckets are keyed by
+# client IP and player ID, since player IDs are public and anyone could drain a shared one.
+# Creating players and lobbies grows server state, so it gets a stricter per-IP budget.
+# Rates and bursts can be overridden with HANGMAN_<NAME>_RATE / HANGMAN_<NAME>_BURST.
+ip_limiter = RateLimiter(rate=env_float("HANGMAN_IP_RATE", 50), capacity=env_float("HANGMAN_IP_BURST", 100))
+player_limiter = RateLimiter(rate=env_float("HANGMAN_PLAYER_RATE", 5), capacity=env_float("HANGMAN_PLAYER_BURST", 10))
+create_limiter = RateLimiter(rate=env_float("HANGMAN_CREATE_RATE", 1), capacity=env_float("HANGMAN_CREATE_BURST", 20))
+CREATE_PATHS = ("/create_player", "/create_lobby", "/players/bulk", "/lobbies/bulk")
+
+# Client IPs that are never rate limited, e.g. "127.0.0.1,::1" for a local load harness
+RATE_LIMIT_EXEMPT = {ip.strip() for ip in os.environ.get("HANGMAN_RATE_LIMIT_EXEMPT", "").split(",") if ip.strip()}
+
+# The /admin endpoints require this token in X-Admin-Token. Unset, they only answer local clients.
+ADMIN_TOKEN = os.environ.get("HANGMAN_ADMIN_TOKEN")
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+# Shed load with 503 when too many requests are in flight or the event loop lags behind
+load_monitor = LoadMonitor(
+    max_in_flight=int(env_float("HANGMAN_MAX_IN_FLIGHT", 500)),
+    max_lag=env_float("HANGMAN_MAX_LAG", 0.2),
+)
+
+# Validated rows of a bulk import are inserted this many at a time
+BULK_BATCH_SIZE = 1000
+
+# Bot players are ordinary players whose ids are listed here.
+# bot_sessions maps game_id -> {player_id: BotPlayer}, next to the GameState in game_sessions.
+bot_ids = set()
+bot_sessions = {}
+solver = HangmanSolver.from_file("words.txt")
+
+# Seconds a bot waits before guessing, 0 to play as fast as possible (load generation)
+BOT_MOVE_DELAY = 0.5
+
+
+def remove_connection(lobby_id: str, websocket: WebSocket):
+    """
+    Removes a WebSocket from the connections of a lobby. Unknown sockets are ignored.
+
+    Args:
+        lobby_id (str): The ID of the lobby.
+        websocket (WebSocket): The WebSocket to remove.
+    """
+    heartbeat_monitor.unregister(websocket)
+    connections = ws_connections.get(lobby_id)
+    if connections and websocket in connections:
+        connections.remove(websocket)
+        if not connections:
+            del ws_connections[lobby_id]
+
+
+async def close_connections(lobby_id: str, code: int = 1000):
+    """
+    Removes and closes every WebSocket of a lobby.
+
+    Args:
+        lobby_id (str): The ID of the lobby.
+        code (int): The WebSocket close code. Default is 1000, normal closure.
+    """
+    for websocket in list(ws_connections.get(lobby_id, [])):
+        remove_connection(lobby_id, websocket)
+        try:
+            await websocket.close(code=code)
+        except Exception:
+            pass
+
+
+async def evict_connection(websocket: WebSocket, lobby_id: str):
+    """Drops a WebSocket that stopped answering heartbeats and closes it."""
+    remove_connection(lobby_id, websocket)
+    topic_subscriptions.remove(websocket)
+    try:
+        await websocket.close()
+    except Exception:
+        pass
+
+
+heartbeat_monitor = HeartbeatMonitor(
+    evict_connection,
+    interval=HEARTBEAT_INTERVAL,
+    timeout=HEARTBEAT_TIMEOUT,
+    idle_after=HEARTBEAT_IDLE_AFTER,
+    send_timeout=SEND_TIMEOUT,
+)
+
+
+async def send_to_all(connections: list, text: str):
+    """
+    Sends the same text to many WebSockets concurrently.
+
+    Each send is bounded by SEND_TIMEOUT. Connections whose send fails or times out
+    are evicted in the background, so a stalled client delays the caller at most once.
+
+    Args:
+        connections (list): The WebSockets to send to.
+        text (str): The encoded message.
+    """
+    results = await asyncio.gather(
+        *(asyncio.wait_for(connection.send_text(text), SEND_TIMEOUT) for connection in connections),
+        return_exceptions=True,
+    )
+    for connection, result in zip(connections, results):
+        if isinstance(result, Exception):
+            task = asyncio.create_task(heartbeat_monitor.evict(connection))
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
+
+
+@app.on_event("startup")
+async def start_load_monitor():
+    load_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_load_monitor():
+    load_monitor.stop()
+
+
+@app.on_event("startup")
+async def start_heartbeat():
+    heartbeat_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_heartbeat():
+    heartbeat_monitor.stop()
+
+
+@app.on_event("startup")
+async def start_lobby_expiry():
+    task = asyncio.create_task(expire_lobbies())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+async def expire_lobbies():
+    """Periodically removes open lobbies that did not fill up within LOBBY_TTL seconds."""
+    while True:
+        await asyncio.sleep(LOBBY_EXPIRY_INTERVAL)
+        now = datetime.now()
+        expired = [
+            lobby for lobby in lobbies
+            if lobby.status == 'open' and (now - lobby.creation_time).total_seconds() > LOBBY_TTL
+        ]
+        for lobby in expired:
+            lobbies.remove(lobby)
+            lobby.status = 'expired'
+            # Waiting /multicast clients receive the lobby.expired event, then the socket closes
+            await event_bus.publish(LobbyExpiredEvent(lobby_id=lobby.id))
+            await close_connections(lobby.id)
+
+
+@app.on_event("startup")
+async def load_archive():
+    global archive
+    if os.path.exists(ARCHIVE_PATH):
+        archive = GameArchive.open(ARCHIVE_PATH)
+
+
+@app.on_event("startup")
+async def start_archive_flush():
+    task = asyncio.create_task(flush_archive())
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+
+async def flush_archive():
+    """Periodically writes the games archived since the last flush to ARCHIVE_PATH."""
+    while True:
+        await asyncio.sleep(ARCHIVE_FLUSH_INTERVAL)
+        archive.flush(ARCHIVE_PATH)
+
+
+@app.on_event("shutdown")
+async def save_archive():
+    archive.save(ARCHIVE_PATH)
+    archive.close()
+
+
+@app.on_event("startup")
+async def open_shard_session():
+    global shard_session
+    if SHARD_NAME:
+        shard_session = aiohttp.ClientSession()
+
+
+@app.on_event("shutdown")
+async def close_shard_session():
+    if shard_session is not None:
+        await shard_session.close()
+
+
+def get_player_id_from_path(path: str) -> str | None:
+    """
+    Extracts the acting player ID from a request path, if the route has one.
+
+    Args:
+        path (str): The request URL path.
+
+    Returns:
+        str | None: The player ID, or None if the route does not identify a player.
+
+    Example:
+        >>> get_player_id_from_path("/guess/game1/player1/a")
+        'player1'
+    """
+    parts = path.strip("/").split("/")
+    if len(parts) == 4 and parts[0] == "guess":
+        return parts[2]
+    if len(parts) == 4 and parts[0] == "lobby" and parts[2] == "join":
+        return parts[3]
+    return None
+
+
+def get_owned_key_from_path(path: str) -> str | None:
+    """
+    Extracts the lobby or game ID that decides which shard serves a request path.
+
+    Args:
+        path (str): The request URL path.
+
+    Returns:
+        str | None: The lobby or game ID, or None if any shard can serve the route.
+
+    Example:
+        >>> get_owned_key_from_path("/guess/game1/player1/a")
+        'game1'
+    """
+    parts = path.strip("/").split("/")
+    if len(parts) >= 2 and parts[0] in ("lobby", "status", "guess"):
+        return parts[1]
+    return None
+
+
+def require_admin(request: Request):
+    """
+    Guards the /admin endpoints.
+
+    With HANGMAN_ADMIN_TOKEN set, the request must carry it in the X-Admin-Token header.
+    Without it, only direct connections from this machine are allowed; requests forwarded
+    by the router carry X-Forwarded-For and are refused.
+
+    Raises:
+        HTTPException(403): If the request may not use the admin endpoints.
+    """
+    if ADMIN_TOKEN:
+        allowed = secrets.compare_digest(request.headers.get("x-admin-token", ""), ADMIN_TOKEN)
+    else:
+        allowed = (request.client is not None and request.client.host in LOOPBACK_HOSTS
+                   and "x-forwarded-for" not in request.headers)
+    if not allowed:
+        raise HTTPException(status_code=403, detail="Admin access denied.")
+
+
+def is_from_router(request: Request) -> bool:
+    """
+    Returns:
+        bool: True if this is a shard and the request carries the shared HANGMAN_SHARD_SECRET.
+    """
+    return bool(SHARD_NAME and SHARD_SECRET) and secrets.compare_digest(
+        request.headers.get("x-shard-secret", ""), SHARD_SECRET)
+
+
+@app.middleware("http")
+async def limit_requests(request: Request, call_next):
+    """
+    Rate limits requests per client IP and per player, and sheds load when overloaded.
+
+    Clients in RATE_LIMIT_EXEMPT skip the token buckets but are still subject to load shedding.
+
+    Returns:
+        Response: 503 with Retry-After if the server is overloaded, 429 with Retry-After
+        if a token bucket is empty, otherwise the response of the route.
+    """
+    if load_monitor.overloaded():
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Server is overloaded. Try again later."},
+            headers={"Retry-After": str(load_monitor.retry_after())},
+        )
+
+    ip = request.client.host if request.client else "unknown"
+    if "x-forwarded-for" in request.headers and is_from_router(request):
+        # The router passes on the address of its client
+        ip = request.headers["x-forwarded-for"].split(",")[0].strip()
+    retry_after = 0
+    if ip not in RATE_LIMIT_EXEMPT:
+        retry_after = ip_limiter.hit(ip)
+
+        player_id = get_player_id_from_path(request.url.path)
+        if not retry_after and player_id:
+            retry_after = player_limiter.hit((ip, player_id))
+
+        if not retry_after and request.url.path in CREATE_PATHS:
+            retry_after = create_limiter.hit(ip)
+
+    if retry_after:
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many requests."},
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
+
+    load_monitor.in_flight += 1
+    try:
+        return await call_next(request)
+    finally:
+        load_monitor.in_flight -= 1
+
+
+@app.middleware("http")
+async def redirect_to_owner(request: Request, call_next):
+    """
+    Sends requests for lobbies and games of another shard to that shard.
+
+    Clients hash IDs on the shard map from GET /shard_map and call the owning shard
+    directly, so their map is stale once a shard is added. The 307 keeps the method
+    and body, and the client reaches the new owner by following it.
+
+    Returns:
+        Response: 307 with the owner's URL in Location, otherwise the response of the route.
+    """
+    key = get_owned_key_from_path(request.url.path)
+    if key is None or owns_key(key):
+        return await call_next(request)
+    url = f"{shard_urls[hash_ring.get_node(key)]}{request.url.path}"
+    if request.url.query:
+        url += f"?{request.url.query}"
+    return JSONResponse(
+        status_code=307,
+        content={"detail": f"{key} belongs to another shard."},
+        headers={"Location": url},
+    )
+
 
 @app.get("/lobbies")
 async def get_lobbies():
@@ -44,6 +479,31 @@ async def get_lobbies():
     return lobbies
 
 
+@app.get("/lobbies/stream")
+async def stream_lobbies(request: Request):
+    """
+    Streams lobby changes as Server-Sent Events.
+
+    New clients first receive a "snapshot" event with the list of lobbies, then only
+    incremental events: "created", "joined", "closed" and "expired". A client that
+    reconnects with the Last-Event-ID header receives just the events it missed, or a
+    new snapshot if they are too old.
+
+    Returns:
+        StreamingResponse: The text/event-stream of lobby events.
+
+    Example:
+        id: 7
+        event: joined
+        data: {"lobby_id": "lobby1", "player_id": "player1", "name": "Alice"}
+    """
+    return StreamingResponse(
+        lobby_stream.subscribe(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
 @app.get('/players')
 async def get_players():
     """
@@ -94,6 +554,347 @@ async def get_games():
     return games
 
 
+@app.get("/history")
+async def get_history(player_id: str | None = None, winner: str | None = None,
+                      since: datetime | None = None, until: datetime | None = None,
+                      limit: int = 100):
+    """
+    Retrieves finished games from the archive, most recent first.
+
+    Args:
+        player_id (str, optional): Only games this player took part in.
+        winner (str, optional): Only games this player won.
+        since (datetime, optional): Only games finished at or after this time.
+        until (datetime, optional): Only games finished at or before this time.
+        limit (int): Maximum number of games to return. Default is 100.
+
+    Returns:
+        List[dict]: The matching finished games.
+
+    Example:
+        [
+            {
+                "id": "game1",
+                "word": "haus",
+                "players": ["player1", "player2"],
+                "winner": "player1",
+                "outcome": "won",
+                "guesses": 4,
+                "finished_at": "2023-06-01T12:00:00"
+            }
+        ]
+    """
+    history = archive.query(
+        player_id=player_id,
+        winner=winner,
+        since=since.timestamp() if since else None,
+        until=until.timestamp() if until else None,
+        limit=limit,
+    )
+    for game in history:
+        game["finished_at"] = datetime.fromtimestamp(game["finished_at"])
+    return history
+
+
+@app.get("/events")
+async def get_event_counts():
+    """
+    Retrieves the number of events published per topic.
+
+    Returns:
+        dict: Event counts by topic.
+
+    Example:
+        {
+            "lobby.joined": 4,
+            "lobby.full": 2,
+            "game.started": 2,
+            "game.guess": 31
+        }
+    """
+    return event_counts
+
+
+@app.get("/admin/memory")
+async def get_memory_usage(request: Request, sample: int = 100):
+    """
+    Estimates the memory used by the in-memory game state.
+
+    Deep sizes are extrapolated from a random sample of each collection, so the
+    endpoint stays cheap however large the state grows.
+
+    Args:
+        sample (int): Number of items measured per collection. Default is 100.
+
+    Returns:
+        dict: Item count, estimated bytes and sample size per collection.
+
+    Raises:
+        HTTPException(403): If the client may not use the admin endpoints, see require_admin.
+
+    Example:
+        {
+            "players": {"count": 1200, "bytes": 460800, "sampled": 100},
+            "games": {"count": 40, "bytes": 96000, "sampled": 40},
+            "archive": {"count": 5000, "bytes": 240000, "sampled": 5000}
+        }
+    """
+    require_admin(request)
+    usage = {
+        name: estimate_collection(collection, sample)
+        for name, collection in (
+            ("players", players),
+            ("lobbies", lobbies),
+            ("games", games),
+            ("game_sessions", game_sessions),
+            ("ws_connections", ws_connections),
+            ("topic_subscriptions", topic_subscriptions.topics),
+        )
+    }
+    # The archive columns are flat buffers, so their size is known exactly
+    usage["archive"] = {
+        "count": len(archive),
+        "bytes": archive.nbytes(),
+        "sampled": len(archive),
+    }
+    return usage
+
+
+@app.post("/admin/memory/snapshots")
+async def take_memory_snapshot(request: Request, limit: int = 10):
+    """
+    Takes a tracemalloc snapshot. The first call starts tracing, which slows down allocations.
+
+    Args:
+        limit (int): Number of top allocation sites to return. Default is 10.
+
+    Returns:
+        dict: The snapshot ID and its top allocation sites.
+
+    Raises:
+        HTTPException(403): If the client may not use the admin endpoints, see require_admin.
+
+    Example:
+        {
+            "id": 1,
+            "top": [{"site": "main.py:530", "bytes": 52000, "count": 400}]
+        }
+    """
+    require_admin(request)
+    snapshot_id = allocation_tracker.take()
+    return {"id": snapshot_id, "top": allocation_tracker.top(snapshot_id, limit)}
+
+
+@app.get("/admin/memory/snapshots/{from_id}/diff/{to_id}")
+async def diff_memory_snapshots(request: Request, from_id: int, to_id: int, limit: int = 10):
+    """
+    Compares two tracemalloc snapshots.
+
+    Args:
+        from_id (int): The ID of the older snapshot.
+        to_id (int): The ID of the newer snapshot.
+        limit (int): Number of allocation sites to return. Default is 10.
+
+    Returns:
+        List[dict]: The allocation sites that changed the most.
+
+    Raises:
+        HTTPException(403): If the client may not use the admin endpoints, see require_admin.
+        HTTPException(404): If a snapshot is unknown or was dropped.
+    """
+    require_admin(request)
+    try:
+        return allocation_tracker.diff(from_id, to_id, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Snapshot not found.")
+
+
+@app.delete("/admin/memory/snapshots")
+async def stop_memory_tracing(request: Request):
+    """
+    Stops tracemalloc and drops all snapshots.
+
+    Returns:
+        dict: A confirmation message.
+
+    Raises:
+        HTTPException(403): If the client may not use the admin endpoints, see require_admin.
+    """
+    require_admin(request)
+    allocation_tracker.stop()
+    return {"detail": "Memory tracing stopped."}
+
+
+@app.get("/shard_map")
+async def get_shard_map():
+    """
+    Retrieves the shards and their URLs, so clients can call the owner of an ID directly.
+
+    An ID belongs to the node utils.hash_ring.HashRing(shards).get_node(id) returns.
+    A server that is not sharded returns an empty map and owns everything.
+
+    Example:
+        {"shard-0": "http://127.0.0.1:8001", "shard-1": "http://127.0.0.1:8002"}
+    """
+    return shard_urls
+
+
+def require_shard_secret(request: Request):
+    """
+    Guards the /internal endpoints, which only the router and other shards may call.
+
+    Raises:
+        HTTPException(403): If the request does not carry HANGMAN_SHARD_SECRET.
+    """
+    if not is_from_router(request):
+        raise HTTPException(status_code=403, detail="Shard secret required.")
+
+
+async def get_shard_identity(request: Request):
+    """
+    Lets the router check that a URL points to this shard before adding it.
+
+    Returns:
+        dict: The name of this shard.
+    """
+    require_shard_secret(request)
+    return {"name": SHARD_NAME}
+
+
+async def get_shard_player(request: Request, player_id: str):
+    """
+    Lets the shard of a lobby fetch a player owned by this shard, see fetch_player.
+
+    Returns:
+        PlayerModel: The player.
+
+    Raises:
+        HTTPException(404): If the player is not found.
+    """
+    require_shard_secret(request)
+    return get_player_by_id(players_by_id, player_id)
+
+
+async def import_shard_state(request: Request, state: dict):
+    """
+    Receives players, lobbies and games handed off by another shard during rebalancing.
+
+    Args:
+        state (dict): Lists of "lobbies", "games" and "players", and the "game_sessions",
+            "lobby_games" and "bot_ids" that belong to them.
+
+    Returns:
+        dict: The number of imported lobbies and games.
+    """
+    require_shard_secret(request)
+    for player_data in state.get("players", []):
+        if player_data["id"] not in players_by_id:
+            add_player(PlayerModel.parse_obj(player_data))
+    bot_ids.update(state.get("bot_ids", []))
+
+    imported_lobbies = [LobbyModel.parse_obj(lobby) for lobby in state.get("lobbies", [])]
+    imported_games = [GameModel.parse_obj(game) for game in state.get("games", [])]
+    lobbies.extend(imported_lobbies)
+    games.extend(imported_games)
+    game_sessions.update({
+        game_id: GameState.from_dict(session) for game_id, session in state.get("game_sessions", {}).items()
+    })
+    lobby_games.update(state.get("lobby_games", {}))
+
+    for game in imported_games:
+        schedule_bot_turn(game)
+
+    return {"lobbies": len(imported_lobbies), "games": len(imported_games)}
+
+
+async def rebalance_shard(request: Request, shards: dict):
+    """
+    Switches to a new shard map and hands off the players, lobbies and games this shard no longer owns.
+
+    Only keys whose owner changed on the ring move. Handed-off players stay here as
+    copies, since lobbies and games on this shard may still refer to them. WebSockets of moved lobbies are
+    closed so clients reconnect through the router to the new owner, and multiplexed
+    connections receive a "moved" frame for each moved topic they followed.
+
+    Args:
+        shards (dict): Maps every shard name to its URL.
+
+    Returns:
+        dict: The number of lobbies and games handed off.
+
+    Raises:
+        HTTPException(400): If this shard is not part of the new shard map.
+    """
+    global shard_urls, hash_ring
+    require_shard_secret(request)
+    if SHARD_NAME not in shards:
+        raise HTTPException(status_code=400, detail=f"Shard {SHARD_NAME} is not in the shard map.")
+    owned_players = [player for player in players if owns_key(player.id)]
+    shard_urls = shards
+    hash_ring = HashRing(shards)
+
+    outgoing = defaultdict(lambda: {
+        "lobbies": [], "games": [], "players": {}, "game_sessions": {}, "lobby_games": {}, "bot_ids": []
+    })
+    moved_lobbies = [lobby for lobby in lobbies if not owns_key(lobby.id)]
+    moved_games = [game for game in games if not owns_key(game.id)]
+
+    for lobby in moved_lobbies:
+        state = outgoing[hash_ring.get_node(lobby.id)]
+        state["lobbies"].append(lobby)
+        if lobby.id in lobby_games:
+            state["lobby_games"][lobby.id] = lobby_games[lobby.id]
+        for player in lobby.players:
+            state["players"][player.id] = player
+    for game in moved_games:
+        state = outgoing[hash_ring.get_node(game.id)]
+        state["games"].append(game)
+        if game.id in game_sessions:
+            state["game_sessions"][game.id] = game_sessions[game.id].to_dict()
+        for player in game.players:
+            state["players"][player.id] = player
+    for player in owned_players:
+        if not owns_key(player.id):
+            outgoing[hash_ring.get_node(player.id)]["players"][player.id] = player
+    for state in outgoing.values():
+        state["bot_ids"] = [player_id for player_id in state["players"] if player_id in bot_ids]
+        state["players"] = list(state["players"].values())
+
+    for shard, state in outgoing.items():
+        async with shard_session.post(f"{shard_urls[shard]}/internal/import", json=jsonable_encoder(state),
+                                      headers={"x-shard-secret": SHARD_SECRET}) as response:
+            response.raise_for_status()
+
+    for lobby in moved_lobbies:
+        lobbies.remove(lobby)
+        lobby_games.pop(lobby.id, None)
+        # 1012: service restart, the client reconnects and reaches the new owner
+        await close_connections(lobby.id, code=1012)
+    # Multiplexed subscribers re-subscribe on the new owner, router.py does so automatically
+    moved_topics = [lobby_topic(lobby.id) for lobby in moved_lobbies] + [game_topic(game.id) for game in moved_games]
+    for topic in moved_topics:
+        for websocket in list(topic_subscriptions.get(topic)):
+            topic_subscriptions.unsubscribe(websocket, topic)
+            try:
+                await websocket.send_json({"op": "moved", "topic": topic})
+            except Exception:
+                pass
+    for game in moved_games:
+        games.remove(game)
+        game_sessions.pop(game.id, None)
+        bot_sessions.pop(game.id, None)
+
+    return {"lobbies": len(moved_lobbies), "games": len(moved_games)}
+
+
+# The internal endpoints only exist on shards started by the router or for it
+if SHARD_NAME:
+    app.get("/internal/shard")(get_shard_identity)
+    app.get("/internal/players/{player_id}")(get_shard_player)
+    app.post("/internal/import")(import_shard_state)
+    app.post("/internal/rebalance")(rebalance_shard)
+
+
 @app.get("/ws_conns")
 async def get_ws_connections():
     """
@@ -117,6 +918,91 @@ async def get_ws_connections():
     return connection_counts
 
 
+@app.get("/ws_stats")
+async def get_ws_stats():
+    """
+    Retrieves WebSocket connection counts by liveness.
+
+    Returns:
+        dict: Counts of active, idle and unresponsive connections, the total number
+        of dead connections evicted by the heartbeat, and the topic subscriptions
+        of the multiplexed connections.
+
+    Example:
+        {
+            "active": 12,
+            "idle": 3,
+            "unresponsive": 1,
+            "dead": 7,
+            "multiplexed": {"connections": 2, "topics": 40, "subscriptions": 45}
+        }
+    """
+    return {**heartbeat_monitor.stats(), "multiplexed": topic_subscriptions.stats()}
+
+
+@app.get("/leaderboard")
+async def get_leaderboard(k: int = 10):
+    """
+    Retrieves the best players, ranked by wins and then by fewest games played.
+
+    Args:
+        k (int): Number of players to return. Default is 10.
+
+    Returns:
+        List[dict]: Statistics of the top k players with their rank.
+
+    Example:
+        [
+            {
+                "rank": 1,
+                "player_id": "player1",
+                "name": "Alice",
+                "games_played": 4,
+                "wins": 3,
+                "guesses": 20,
+                "correct_guesses": 15,
+                "accuracy": 0.75
+            }
+        ]
+    """
+    return [
+        {"rank": rank, **stats.dict()}
+        for rank, stats in enumerate(leaderboard.top(k), start=1)
+    ]
+
+
+@app.get("/players/{player_id}/stats")
+async def get_player_stats(player_id: str):
+    """
+    Retrieves the statistics and leaderboard rank of a player.
+
+    Args:
+        player_id (str): The ID of the player.
+
+    Returns:
+        dict: The player statistics with their rank.
+
+    Raises:
+        HTTPException(404): If the player has not played yet.
+
+    Example:
+        {
+            "rank": 3,
+            "player_id": "player1",
+            "name": "Alice",
+            "games_played": 2,
+            "wins": 1,
+            "guesses": 9,
+            "correct_guesses": 5,
+            "accuracy": 0.5555555555555556
+        }
+    """
+    if player_id not in leaderboard.stats:
+        raise HTTPException(
+            status_code=404, detail=f"No statistics for player with id: {player_id}")
+    return {"rank": leaderboard.rank(player_id), **leaderboard.stats[player_id].dict()}
+
+
 @app.get("/status/{game_id}")
 async def get_status_player(game_id: str):
     """
@@ -159,7 +1045,9 @@ async def create_lobby(lobby: LobbyModel):
             "players": []
         }
     """
+    require_owner(lobby.id, "/create_lobby")
     lobbies.append(lobby)
+    await event_bus.publish(LobbyCreatedEvent(lobby=lobby))
     return lobby
 
 
@@ -168,6 +1056,9 @@ async def create_player(player: PlayerModel):
     """
     Creates a new player.
 
+    Behind the router, the player is stored on the shard its ID hashes to and fetched
+    by the shards of the lobbies it joins, see fetch_player.
+
     Args:
         player (PlayerModel): The player details.
 
@@ -180,10 +1071,160 @@ async def create_player(player: PlayerModel):
             "name": "Alice"
         }
     """
-    players.append(player)
+    require_owner(player.id, "/create_player")
+    add_player(player)
     return player
 
 
+def add_player(player: PlayerModel):
+    """Stores a player and indexes it by ID."""
+    players.append(player)
+    players_by_id[player.id] = player
+
+
+async def fetch_player(player_id: str) -> PlayerModel:
+    """
+    Gets a player, asking the shard that owns its ID if it is not known here yet.
+
+    A fetched player is kept here, so the player's later joins and guesses on this
+    shard do not leave it.
+
+    Args:
+        player_id (str): The ID of the player.
+
+    Returns:
+        PlayerModel: The player.
+
+    Raises:
+        HTTPException(404): If the player is not found.
+    """
+    if player_id in players_by_id or owns_key(player_id):
+        return get_player_by_id(players_by_id, player_id)
+
+    url = shard_urls[hash_ring.get_node(player_id)]
+    async with shard_session.get(f"{url}/internal/players/{player_id}",
+                                 headers={"x-shard-secret": SHARD_SECRET}) as response:
+        if response.status == 404:
+            raise HTTPException(status_code=404, detail=f"Player Not Found with id: {player_id}")
+        response.raise_for_status()
+        player = PlayerModel.parse_obj(await response.json())
+    # Another join of the same player may have fetched it meanwhile
+    if player_id not in players_by_id:
+        add_player(player)
+    return players_by_id[player_id]
+
+
+def require_owner(key: str, path: str):
+    """
+    Refuses to create a lobby or player whose ID belongs to another shard, see redirect_to_owner.
+
+    Args:
+        key (str): The ID of the new lobby or player.
+        path (str): The path of the request, repeated on the owning shard.
+
+    Raises:
+        HTTPException(307): If another shard owns the ID, with that shard's URL in Location.
+    """
+    if not owns_key(key):
+        raise HTTPException(
+            status_code=307,
+            detail=f"{key} belongs to another shard.",
+            headers={"Location": f"{shard_urls[hash_ring.get_node(key)]}{path}"},
+        )
+
+
+async def bulk_import(request: Request, model, db: list, on_insert=None) -> StreamingResponse:
+    """
+    Imports NDJSON rows from the request body into an in-memory collection.
+
+    The body is parsed and validated line by line as it arrives, and valid rows are
+    inserted in batches of BULK_BATCH_SIZE. One NDJSON result row is streamed back per
+    input line, with the ID of the created object or the validation error.
+
+    Args:
+        request (Request): The request with an NDJSON body.
+        model: The pydantic model to validate every row with.
+        db (list): The collection to insert the valid rows into.
+        on_insert (callable, optional): Coroutine function called with each inserted batch.
+
+    Returns:
+        StreamingResponse: NDJSON result rows, in input order.
+    """
+    chunks = []
+    batch = []
+    results = []
+
+    async def flush():
+        db.extend(batch)
+        if on_insert:
+            await on_insert(batch)
+        batch.clear()
+        chunks.append("".join(results).encode())
+        results.clear()
+
+    async for number, line in iter_ndjson_lines(request.stream()):
+        try:
+            item = model.parse_raw(line)
+        except ValidationError as e:
+            results.append(json.dumps({"line": number, "error": e.errors()}, default=str) + "\n")
+        else:
+            batch.append(item)
+            results.append(json.dumps({"line": number, "id": item.id}) + "\n")
+
+        if len(results) >= BULK_BATCH_SIZE:
+            await flush()
+    await flush()
+
+    # The body is fully read before the response starts, as the streaming response
+    # and the request body share the same ASGI receive channel.
+    return StreamingResponse(iter(chunks), media_type="application/x-ndjson")
+
+
+@app.post('/players/bulk')
+async def create_players_bulk(request: Request):
+    """
+    Creates many players from an NDJSON body, one PlayerModel per line.
+
+    Returns:
+        StreamingResponse: One NDJSON row per input line with the player ID or the error.
+
+    Example:
+        Request body:
+            {"name": "Alice"}
+            {"nam": "Bob"}
+        Response body:
+            {"line": 1, "id": "player1"}
+            {"line": 2, "error": [{"loc": ["name"], "msg": "field required", "type": "value_error.missing"}]}
+    """
+    async def index_players(batch):
+        players_by_id.update((player.id, player) for player in batch)
+
+    return await bulk_import(request, PlayerModel, players, index_players)
+
+
+@app.post('/lobbies/bulk')
+async def create_lobbies_bulk(request: Request):
+    """
+    Creates many lobbies from an NDJSON body, one LobbyModel per line.
+
+    Returns:
+        StreamingResponse: One NDJSON row per input line with the lobby ID or the error.
+
+    Example:
+        Request body:
+            {"maxPlayers": 4}
+            {"maxPlayers": "four"}
+        Response body:
+            {"line": 1, "id": "lobby1"}
+            {"line": 2, "error": [{"loc": ["maxPlayers"], "msg": "value is not a valid integer", "type": "type_error.integer"}]}
+    """
+    async def publish_created(batch):
+        for lobby in batch:
+            await event_bus.publish(LobbyCreatedEvent(lobby=lobby))
+
+    return await bulk_import(request, LobbyModel, lobbies, publish_created)
+
+
 @app.post('/lobby/{lobby_id}/join/{player_id}')
 async def join_player_lobby(lobby_id: str, player_id: str):
     """
@@ -208,7 +1249,7 @@ async def join_player_lobby(lobby_id: str, player_id: str):
             "status": "closed"
         }
     """
-    player = get_player_by_id(players, player_id)
+    player = await fetch_player(player_id)
     lobby = get_lobby_by_id(lobbies, lobby_id)
 
     if lobby is None or player is None:
@@ -219,13 +1260,62 @@ async def join_player_lobby(lobby_id: str, player_id: str):
         raise HTTPException(status_code=403, detail="Lobby is closed.")
 
     lobby.players.append(player)
-
-    if len(lobby.players) == lobby.maxPlayers:
+    # Close the lobby before the first await, so concurrent joins cannot overfill it.
+    # A closed lobby rejects further joins, so lobby.full is published once per lobby.
+    full = len(lobby.players) >= lobby.maxPlayers
+    if full:
         lobby.status = 'closed'
 
+    await event_bus.publish(
+        PlayerJoinedEvent(lobby_id=lobby.id, player_id=player.id, name=player.name))
+    if full:
+        await event_bus.publish(LobbyFullEvent(lobby_id=lobby.id))
+
     return lobby
 
 
+@app.post('/lobby/{lobby_id}/bots')
+async def add_bots(lobby_id: str, count: int | None = None):
+    """
+    Fills a lobby with bot players.
+
+    Bots are regular players that guess through the same path as everyone else,
+    using the letter-frequency solver. A lobby with only bots is useful for load generation.
+
+    Args:
+        lobby_id (str): The ID of the lobby to fill.
+        count (int, optional): Number of bots to add. Defaults to the free slots in the lobby.
+
+    Returns:
+        dict: The updated lobby and the game ID if the lobby is now full.
+
+    Raises:
+        HTTPException(403): If the lobby is closed.
+        HTTPException(404): If the lobby is not found.
+
+    Example:
+        {
+            "lobby": {"id": "lobby1", "players": [...], "status": "closed"},
+            "game_id": "game1"
+        }
+    """
+    lobby = get_lobby_by_id(lobbies, lobby_id)
+    free_slots = lobby.maxPlayers - len(lobby.players)
+    if count is None or count > free_slots:
+        count = free_slots
+
+    for _ in range(count):
+        bot = PlayerModel(name=f"Bot-{len(bot_ids) + 1}")
+        add_player(bot)
+        bot_ids.add(bot.id)
+        lobby = await join_player_lobby(lobby_id, bot.id)
+
+    return {
+        "lobby": lobby,
+        "game_id": lobby_games.get(lobby_id)
+    }
+
+
 @app.websocket("/multicast/{lobby_id}")
 async def websocket_endpoint(websocket: WebSocket, lobby_id: str):
     """
@@ -239,9 +1329,11 @@ async def websocket_endpoint(websocket: WebSocket, lobby_id: str):
         WebSocketDisconnect: If the WebSocket connection is disconnected.
 
     Notes:
-        - This endpoint expects messages from connected clients in the lobby.
-        - It multicast the received message to Specific connected clients in the lobby.
-        - If the lobby is full, it broadcasts a "lobby is full" status to the clients.
+        - Lobby and game events are multicast to the connected clients by the event
+          bus subscribers below, not by this receive loop.
+        - If the game of the lobby already started, the "done" status is sent on connect.
+        - Connections to a lobby that belongs to another shard are closed with 1012.
+        - Received messages only keep the connection alive, e.g. heartbeat replies.
         - If the WebSocket connection is disconnected, it removes the connection from the lobby.
         - Handles other exceptions that may occur during WebSocket communication.
 
@@ -252,55 +1344,132 @@ async def websocket_endpoint(websocket: WebSocket, lobby_id: str):
     # Broadcast that a new player has joined the lobby
     print("Lobby ID:", lobby_id)
     await websocket.accept()
+    if not owns_key(lobby_id):
+        # 1012: service restart, the client looks up the owner again and reconnects there
+        await websocket.close(code=1012)
+        return
 
     if lobby_id not in ws_connections:
         ws_connections[lobby_id] = []
 
     ws_connections[lobby_id].append(websocket)
+    heartbeat_monitor.register(websocket, lobby_id)
     print(ws_connections)
 
     try:
+        # The lobby may have filled up before this client connected
+        if lobby_id in lobby_games:
+            await websocket.send_json({"status": "done", "game_id": lobby_games[lobby_id]})
+
         while True:
-            lobby = get_lobby_by_id(lobbies, lobby_id)
             data = await websocket.receive_text()
-            user = get_player_by_id(players, data)
-            sock_data = f"Username: {user.name} with ID: {user.id} joined the lobby"
-
-            game = None
-
-            # Broadcast the received message to all connected clients in the lobby
-            for connection in ws_connections[lobby_id]:
-                if lobby.maxPlayers == len(lobby.players):
-                    # Broadcast status to clients that the lobby is full
-                    if game is None:
-                        random_word = get_random_word()
-                        game = GameModel(
-                            word=random_word,
-                            max_attempts=6,
-                            players=lobby.players,
-                            word_status="-" * len(random_word)
-                        )
-                        games.append(game)
-                    payload = {
-                        "status": "done",
-                        "game_id": game.id
-                    }
-                    await connection.send_json(payload)
-                else:
-                    if connection != websocket:
-                        payload = {
-                            "message": sock_data
-                        }
-                        await connection.send_json(payload)
+            heartbeat_monitor.touch(websocket, parse_json_message(data))
 
     except WebSocketDisconnect:
         # Handle disconnection gracefully
-        ws_connections[lobby_id].remove(websocket)
+        remove_connection(lobby_id, websocket)
 
     except Exception as e:
         # Handle other exceptions
         print(f"An error occurred: {str(e)}")
-        ws_connections[lobby_id].remove(websocket)
+        remove_connection(lobby_id, websocket)
+
+
+@app.websocket("/ws")
+async def multiplexed_endpoint(websocket: WebSocket):
+    """
+    WebSocket endpoint carrying the events of many lobbies and games over one connection.
+
+    Clients send control frames to choose their topics, "lobby:<lobby_id>" or
+    "game:<game_id>", and receive every event of those topics tagged with the topic.
+    This receive loop is the only task of the connection; events are sent by the
+    event bus subscriber multiplex_event.
+
+    Raises:
+        WebSocketDisconnect: If the WebSocket connection is disconnected.
+
+    Example:
+        Client: {"op": "subscribe", "topic": "lobby:lobby1"}
+        Server: {"op": "subscribed", "topic": "lobby:lobby1"}
+        Server: {"topic": "lobby:lobby1", "event": "game.started", "lobby_id": "lobby1", "game_id": "game1"}
+        Client: {"op": "unsubscribe", "topic": "lobby:lobby1"}
+        Server: {"op": "unsubscribed", "topic": "lobby:lobby1"}
+    """
+    await websocket.accept()
+    heartbeat_monitor.register(websocket, None)
+
+    try:
+        while True:
+            message = parse_json_message(await websocket.receive_text())
+            if heartbeat_monitor.touch(websocket, message):
+                continue
+            await handle_control_frame(websocket, message)
+
+    except WebSocketDisconnect:
+        pass
+
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+
+    finally:
+        heartbeat_monitor.unregister(websocket)
+        topic_subscriptions.remove(websocket)
+
+
+async def handle_control_frame(websocket: WebSocket, message: dict | None):
+    """
+    Applies a subscribe or unsubscribe frame of a multiplexed connection and acknowledges it.
+
+    Invalid frames are answered with an error frame and otherwise ignored. Subscribing to
+    a lobby whose game already started sends its game.started event right away.
+
+    Args:
+        websocket (WebSocket): The multiplexed connection.
+        message (dict | None): The decoded frame.
+    """
+    op = message.get("op") if message else None
+    topic = message.get("topic") if message else None
+    parsed = parse_topic(topic)
+
+    if op not in ("subscribe", "unsubscribe") or parsed is None:
+        await websocket.send_json({"op": "error", "topic": topic,
+                                   "detail": "Expected a subscribe or unsubscribe op with a lobby:<id> or game:<id> topic."})
+        return
+
+    if op == "unsubscribe":
+        topic_subscriptions.unsubscribe(websocket, topic)
+        await websocket.send_json({"op": "unsubscribed", "topic": topic})
+        return
+
+    if not topic_subscriptions.subscribe(websocket, topic):
+        await websocket.send_json({"op": "error", "topic": topic,
+                                   "detail": f"At most {MUX_MAX_TOPICS} topics per connection."})
+        return
+    await websocket.send_json({"op": "subscribed", "topic": topic})
+
+    # The lobby may have filled up before this client subscribed
+    kind, key = parsed
+    if kind == "lobby" and key in lobby_games:
+        await websocket.send_json({"topic": topic, "event": GameStartedEvent.topic,
+                                   "lobby_id": key, "game_id": lobby_games[key]})
+
+
+def parse_json_message(data: str) -> dict | None:
+    """
+    Decodes a WebSocket text message if it is a JSON object.
+
+    Args:
+        data (str): The received text.
+
+    Returns:
+        dict | None: The decoded object, or None for plain text such as a player ID.
+    """
+    if not data.startswith("{"):
+        return None
+    try:
+        return json.loads(data)
+    except ValueError:
+        return None
 
 
 @app.post("/guess/{game_id}/{user_id}/{char}")
@@ -321,89 +1490,291 @@ async def make_guess(game_id: str, user_id: str, char: str):
 
     Notes:
         - This endpoint allows a user to make a guess for the given game by providing the game ID, user ID, and character.
-        - The guess is validated, and the game status and word status are updated accordingly.
+        - The guess is applied by the game's utils.game_engine.GameState kept in game_sessions,
+          the same rules the headless simulator plays by. The game model mirrors its state.
         - If the guess is correct and the word is fully guessed, the game is finished, and the user is declared the winner.
         - If the guess is incorrect, the user loses a life, and the hangman status is updated.
-        - The game state is maintained in the game_sessions dictionary.
 
     """
     game: GameModel = get_game_by_id(games, game_id)
-    player = get_player_by_id(players, user_id)
+    player = get_player_by_id(players_by_id, user_id)
+    state: GameState = game_sessions[game_id]
 
-    if len(char) != 1:
-        raise HTTPException(
-            status_code=400, detail="Invalid parameter: char length should be 1"
-        )
+    try:
+        outcome = state.guess(player.id, char)
+    except GameRuleError as e:
+        raise HTTPException(status_code=400, detail=e.detail)
+
+    game_players = {game_player.id: game_player for game_player in game.players}
+    game.players = [game_players[player_id] for player_id in state.players]
+    game.guessed_chars = list(state.guessed_chars)
+    game.word_status = state.word_status
+    game.status = state.status
+    game.winner = state.winner
+    lives = state.lives[player.id]
+
+    await publish_guess(game, player, char, correct=outcome in (CORRECT, WON))
+
+    if outcome == WON:
+        await event_bus.publish(
+            GameFinishedEvent(lobby_id=game.lobby_id, game_id=game.id, winner=user_id))
+        return {
+            "detail": "Congratulations! You guessed the word correctly. You are the winner.",
+            "word_status": game.word_status,
+            "game": game,
+        }
+    if outcome == CORRECT:
+        return {
+            "detail": f"You guessed the character: Word status {game.word_status}",
+            "lives": lives,
+        }
 
-    # Check if it's the player's turn
-    if player.id != game.players[0].id:
-        raise HTTPException(
-            status_code=400, detail="It's not your turn to guess."
-        )
+    if outcome == ELIMINATED:
+        await event_bus.publish(PlayerEliminatedEvent(
+            lobby_id=game.lobby_id, game_id=game.id, player_id=player.id, name=player.name))
+        if game.status == "finished":
+            await event_bus.publish(GameFinishedEvent(lobby_id=game.lobby_id, game_id=game.id))
 
-    if game.status != "open":
-        winner = await get_player_by_id(players, game.winner)
-        raise HTTPException(
-            status_code=400,
-            detail=f"Game has already finished. WinnerId: {winner.id}, Winner Name: {winner.name}",
-        )
+    return {
+        "detail": f"Invalid character: Word status {game.word_status}, lives: {lives}",
+        "hangman": show_hangman(5 - lives),
+        "lives": lives,
+    }
 
-    game.players = game.players[1:] + [game.players[0]]
 
-    # Initialize Game Session
-    if not game_sessions.get(game_id):
-        print("Initialize Game Session")
-        game_sessions[game_id] = {
-            user_id: {
-                "lives": game.max_attempts
-            }
-        }
+def create_game(lobby: LobbyModel) -> GameModel:
+    """
+    Creates a new game with a random word for the players of a full lobby.
 
-    # Initialize UserID in game Sessions
-    if not game_sessions[game_id].get(user_id):
-        game_sessions[game_id][user_id] = {
-            "lives": game.max_attempts
-        }
+    Args:
+        lobby (LobbyModel): The lobby whose players take part in the game.
 
-    if game_sessions[game_id][user_id]["lives"] == 0:
-        games.remove(game)
-        game.players.remove(player)
-        print(game)
-        games.append(game)
-        raise HTTPException(
-            status_code=400, detail="You have run out of lives. Game over."
-        )
+    Returns:
+        GameModel: The created game.
+    """
+    if hash_ring.nodes and SHARD_NAME not in hash_ring.nodes:
+        raise RuntimeError(f"Shard {SHARD_NAME!r} is not on the hash ring and cannot own new games.")
+    # Pick an ID that hashes to this shard, so the router sends the game's requests here
+    game_id = uuid4().hex
+    while not owns_key(game_id):
+        game_id = uuid4().hex
+
+    random_word = get_random_word()
+    game = GameModel(
+        id=game_id,
+        word=random_word,
+        max_attempts=6,
+        players=lobby.players,
+        word_status="-" * len(random_word),
+        lobby_id=lobby.id
+    )
+    games.append(game)
+    game_sessions[game.id] = GameState(
+        game.word, [game_player.id for game_player in game.players], game.max_attempts)
+    return game
+
+
+def owns_key(key: str) -> bool:
+    """
+    Returns:
+        bool: True if the lobby or game with this ID belongs to this shard.
+    """
+    return not hash_ring.nodes or hash_ring.get_node(key) == SHARD_NAME
 
-    if char in game.word and char not in game.guessed_chars:
-        game.guessed_chars.append(char)
-        indices = find_all_occurrences(game.word, char)
-        game.word_status = replace_char_at_indices(
-            game.word_status, indices, char
-        )
 
-        if game.word_status == game.word:
-            game.status = "finished"
-            game.winner = user_id
-            return {
-                "detail": "Congratulations! You guessed the word correctly. You are the winner.",
-                "word_status": game.word_status,
-                "game": game,
-            }
+async def publish_guess(game: GameModel, player: PlayerModel, char: str, correct: bool):
+    """Publishes a GuessEvent for a guess that was applied to the game."""
+    await event_bus.publish(GuessEvent(
+        lobby_id=game.lobby_id,
+        game_id=game.id,
+        player_id=player.id,
+        name=player.name,
+        char=char,
+        correct=correct,
+        word_status=game.word_status,
+        lives=game_sessions[game.id].lives[player.id],
+    ))
 
-        return {
-            "detail": f"You guessed the character: Word status {game.word_status}",
-            "lives": game_sessions[game_id][user_id]["lives"],
-        }
 
+def archive_game(game: GameModel):
+    """
+    Moves a game that ended out of the in-memory game list into the archive.
+
+    Args:
+        game (GameModel): The finished game.
+    """
+    # Eliminated players are removed from game.players, but every player who guessed has lives
+    state = game_sessions.get(game.id)
+    participants = dict.fromkeys(
+        [game_player.id for game_player in game.players] + (list(state.lives) if state else []))
+    archive.append(
+        game_id=game.id,
+        word=game.word,
+        player_ids=participants,
+        winner=game.winner,
+        guesses=len(game.guessed_chars),
+        finished_at=time.time(),
+    )
+    if archive.pending() >= ARCHIVE_FLUSH_GAMES:
+        archive.flush(ARCHIVE_PATH)
+    games.remove(game)
+    game_sessions.pop(game.id, None)
+    bot_sessions.pop(game.id, None)
+
+
+# Keep references to running bot tasks so they are not garbage collected
+bot_tasks = set()
+
+
+def schedule_bot_turn(game: GameModel):
+    """
+    Schedules a move if the player whose turn it is in the given game is a bot.
+
+    Args:
+        game (GameModel): The game to check.
+    """
+    if game.status != "open" or not game.players or game.players[0].id not in bot_ids:
+        return
+    task = asyncio.create_task(play_bot_turn(game.id))
+    bot_tasks.add(task)
+    task.add_done_callback(bot_tasks.discard)
+
+
+async def play_bot_turn(game_id: str):
+    """
+    Plays one move for the bot whose turn it is, through the regular make_guess path.
+
+    Args:
+        game_id (str): The ID of the game.
+    """
+    await asyncio.sleep(BOT_MOVE_DELAY)
+
+    try:
+        game = get_game_by_id(games, game_id)
+    except HTTPException:
+        # The game ended and was archived in the meantime
+        return
+
+    bot_id = game.players[0].id
+    if bot_id not in bot_ids:
+        return
+
+    bot = bot_sessions.setdefault(game_id, {}).setdefault(bot_id, BotPlayer(solver))
+    char = bot.choose(game.word_status, game.guessed_chars)
+    if char is None:
+        return
+
+    try:
+        await make_guess(game_id, bot_id, char)
+    except HTTPException as e:
+        print(f"Bot {bot_id} could not guess: {e.detail}")
+        return
+
+    bot.record(char, game.guessed_chars)
+
+
+# Event subscribers
+
+
+async def start_game(event: LobbyFullEvent):
+    """Creates the game of a full lobby. Starting a lobby twice is a no-op."""
+    if event.lobby_id in lobby_games:
+        return
+    game = create_game(get_lobby_by_id(lobbies, event.lobby_id))
+    lobby_games[event.lobby_id] = game.id
+    await event_bus.publish(GameStartedEvent(lobby_id=event.lobby_id, game_id=game.id))
+
+
+async def multicast_event(event):
+    """Sends an event to every WebSocket connected to its lobby, encoded once."""
+    connections = ws_connections.get(event.lobby_id)
+    if not connections:
+        return
+
+    if isinstance(event, PlayerJoinedEvent):
+        payload = {"message": f"Username: {event.name} with ID: {event.player_id} joined the lobby"}
+    elif isinstance(event, GameStartedEvent):
+        payload = {"status": "done", "game_id": event.game_id}
     else:
-        game_sessions[game_id][user_id]["lives"] -= 1
-        if game_sessions[game_id][user_id]["lives"] == 0:
-            # games.remove(game)
-            game.players.remove(player)
-            
+        payload = {"event": event.topic, **event.dict()}
+    await send_to_all(list(connections), json.dumps(payload))
 
-    return {
-        "detail": f"Invalid character: Word status {game.word_status}, lives: {game_sessions[game_id][user_id]['lives']}",
-        "hangman": show_hangman(5 - game_sessions[game_id][user_id]["lives"]),
-        "lives": game_sessions[game_id][user_id]["lives"],
-    }
+
+async def multiplex_event(event):
+    """
+    Sends an event to the multiplexed connections subscribed to its game or lobby.
+
+    Each connection receives the event once, tagged with the topic it subscribed to,
+    and the event is encoded once per topic.
+    """
+    topics = []
+    if getattr(event, "game_id", None):
+        topics.append(game_topic(event.game_id))
+    if getattr(event, "lobby_id", None):
+        topics.append(lobby_topic(event.lobby_id))
+
+    await asyncio.gather(*(
+        send_to_all(connections, json.dumps({"topic": topic, "event": event.topic, **event.dict()}, default=str))
+        for topic, connections in topic_subscriptions.recipients(topics).items()
+    ))
+
+
+async def record_stats(event):
+    """Updates the leaderboard from guesses and players leaving a game."""
+    if isinstance(event, GuessEvent):
+        leaderboard.record_guess(event.player_id, event.name, event.correct)
+    elif isinstance(event, PlayerEliminatedEvent):
+        leaderboard.record_game_end(event.player_id, event.name, won=False)
+    elif isinstance(event, GameFinishedEvent) and event.winner:
+        for game_player in get_game_by_id(games, event.game_id).players:
+            leaderboard.record_game_end(
+                game_player.id, game_player.name, won=game_player.id == event.winner)
+
+
+async def archive_finished_game(event: GameFinishedEvent):
+    """Moves a finished game into the archive."""
+    archive_game(get_game_by_id(games, event.game_id))
+
+
+async def schedule_bot_on_event(event):
+    """Lets a bot play when a game starts or a guess passes the turn to it."""
+    try:
+        game = get_game_by_id(games, event.game_id)
+    except HTTPException:
+        return
+    schedule_bot_turn(game)
+
+
+async def stream_lobby_event(event):
+    """Forwards lobby changes to the lobby browsers."""
+    if isinstance(event, LobbyCreatedEvent):
+        lobby_stream.publish("created", event.lobby.dict())
+    elif isinstance(event, PlayerJoinedEvent):
+        lobby_stream.publish("joined", event.dict())
+    elif isinstance(event, LobbyFullEvent):
+        lobby_stream.publish("closed", event.dict())
+    elif isinstance(event, LobbyExpiredEvent):
+        lobby_stream.publish("expired", event.dict())
+
+
+async def count_event(event):
+    """Counts published events per topic."""
+    event_counts[event.topic] = event_counts.get(event.topic, 0) + 1
+
+
+event_bus.subscribe(LobbyFullEvent.topic, start_game)
+for event_model in (LobbyCreatedEvent, PlayerJoinedEvent, LobbyFullEvent, LobbyExpiredEvent):
+    event_bus.subscribe(event_model.topic, stream_lobby_event)
+for event_model in (PlayerJoinedEvent, LobbyExpiredEvent, GameStartedEvent, GuessEvent, PlayerEliminatedEvent,
+                    GameFinishedEvent):
+    event_bus.subscribe(event_model.topic, multicast_event)
+for event_model in (PlayerJoinedEvent, LobbyFullEvent, LobbyExpiredEvent, GameStartedEvent, GuessEvent,
+                    PlayerEliminatedEvent, GameFinishedEvent):
+    event_bus.subscribe(event_model.topic, multiplex_event)
+for event_model in (GuessEvent, PlayerEliminatedEvent, GameFinishedEvent):
+    event_bus.subscribe(event_model.topic, record_stats)
+for event_model in (GameStartedEvent, GuessEvent):
+    event_bus.subscribe(event_model.topic, schedule_bot_on_event)
+# Archiving removes the game from `games`, so it runs after the other game.finished subscribers
+event_bus.subscribe(GameFinishedEvent.topic, archive_finished_game)
+event_bus.subscribe(ALL_TOPICS, count_event)
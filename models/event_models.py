@@ -0,0 +1,72 @@
+from typing import ClassVar
+
+from pydantic import BaseModel
+
+from models.game_models import LobbyModel
+
+
+class EventModel(BaseModel):
+    topic: ClassVar[str] = ''
+
+
+class PlayerJoinedEvent(EventModel):
+    topic: ClassVar[str] = 'lobby.joined'
+
+    lobby_id: str
+    player_id: str
+    name: str
+
+
+class LobbyFullEvent(EventModel):
+    topic: ClassVar[str] = 'lobby.full'
+
+    lobby_id: str
+
+
+class GameStartedEvent(EventModel):
+    topic: ClassVar[str] = 'game.started'
+
+    lobby_id: str
+    game_id: str
+
+
+class GuessEvent(EventModel):
+    topic: ClassVar[str] = 'game.guess'
+
+    lobby_id: str | None = None
+    game_id: str
+    player_id: str
+    name: str
+    char: str
+    correct: bool
+    word_status: str
+    lives: int
+
+
+class PlayerEliminatedEvent(EventModel):
+    topic: ClassVar[str] = 'game.eliminated'
+
+    lobby_id: str | None = None
+    game_id: str
+    player_id: str
+    name: str
+
+
+class GameFinishedEvent(EventModel):
+    topic: ClassVar[str] = 'game.finished'
+
+    lobby_id: str | None = None
+    game_id: str
+    winner: str | None = None
+
+
+class LobbyCreatedEvent(EventModel):
+    topic: ClassVar[str] = 'lobby.created'
+
+    lobby: LobbyModel
+
+
+class LobbyExpiredEvent(EventModel):
+    topic: ClassVar[str] = 'lobby.expired'
+
+    lobby_id: str
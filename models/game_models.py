@@ -26,4 +26,15 @@ class GameModel(BaseModel):
     winner: PlayerModel | None = None
     players: List[PlayerModel] = []
     word_status: str = ''
-    guessed_chars: List = []
\ No newline at end of file
+    guessed_chars: List = []
+    lobby_id: str | None = None
+
+
+class PlayerStatsModel(BaseModel):
+    player_id: str
+    name: str = ''
+    games_played: int = 0
+    wins: int = 0
+    guesses: int = 0
+    correct_guesses: int = 0
+    accuracy: float = 0.0
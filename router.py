@@ -0,0 +1,732 @@
+import argparse
+import asyncio
+import json
+import os
+import posixpath
+import secrets
+import signal
+import subprocess
+import sys
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+import aiohttp
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+
+from utils.hash_ring import HashRing
+from utils.heartbeat import PING_MESSAGE, PONG_TYPE
+from utils.io_helpers import iter_ndjson_lines
+from utils.sse import EventStream, read_events
+from utils.topics import parse_topic
+
+app = FastAPI()
+
+# Shard name -> base URL of the worker. Filled from HANGMAN_SHARDS, or by __main__.
+shard_urls: dict = json.loads(os.environ.get("HANGMAN_SHARDS", "{}"))
+hash_ring = HashRing(shard_urls)
+session: aiohttp.ClientSession | None = None
+# Proves to the shards that a request comes from the router, see main.is_from_router.
+# Shards added with POST /shards must be started with the same HANGMAN_SHARD_SECRET.
+SHARD_SECRET = os.environ.get("HANGMAN_SHARD_SECRET") or secrets.token_hex(16)
+
+# Headers that describe the hop between the client and the router, not the request
+HOP_HEADERS = {"host", "content-length", "connection", "transfer-encoding", "keep-alive", "upgrade"}
+# aiohttp decompresses shard responses, so their encoding and length do not apply to the relayed body
+RESPONSE_SKIP_HEADERS = HOP_HEADERS | {"content-encoding", "date", "server"}
+
+# The lobbies of every shard as last seen on its /lobbies/stream, by shard name and lobby ID.
+# The router follows each shard's stream and re-publishes the events under its own event IDs.
+shard_lobbies: dict = {}
+lobby_stream = EventStream(lambda: [lobby for lobbies in shard_lobbies.values() for lobby in lobbies.values()])
+lobby_followers: dict = {}
+# Shards whose first snapshot has not arrived yet after (re)starting the followers
+pending_snapshots: set = set()
+# Seconds before the router reconnects to a shard's lobby stream
+FOLLOW_RETRY_DELAY = 1.0
+
+# Heartbeat of the multiplexed client connections in seconds, as on the shards
+HEARTBEAT_INTERVAL = 10
+HEARTBEAT_TIMEOUT = 30
+
+
+@app.on_event("startup")
+async def open_session():
+    global session
+    # One pooled session for all forwarded requests; shards are local, so no connection limit
+    session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=0))
+    follow_all_lobbies()
+
+
+@app.on_event("shutdown")
+async def close_session():
+    for follower in lobby_followers.values():
+        follower.cancel()
+    await session.close()
+
+
+def shard_for(key: str) -> str:
+    """
+    Returns:
+        str: The URL of the shard owning a lobby or game ID.
+
+    Raises:
+        HTTPException(503): If no shard is configured.
+    """
+    try:
+        return shard_urls[hash_ring.get_node(key)]
+    except LookupError:
+        raise HTTPException(status_code=503, detail="No shards available.")
+
+
+def shard_headers(request: Request | None = None) -> dict:
+    """
+    Returns:
+        dict: The shard secret and, for a client request, the client address in X-Forwarded-For.
+    """
+    headers = {"x-shard-secret": SHARD_SECRET}
+    if request is not None and request.client:
+        headers["x-forwarded-for"] = request.client.host
+    return headers
+
+
+async def forward(request: Request, shard_url: str, body: bytes | None = None, path: str | None = None) -> Response:
+    """
+    Forwards a request to a shard and returns the shard's response unchanged.
+
+    Args:
+        request (Request): The incoming request.
+        shard_url (str): Base URL of the shard.
+        body (bytes, optional): Replaces the request body.
+        path (str, optional): Replaces the request path.
+
+    Returns:
+        Response: The status, body and headers of the shard's response, e.g. Retry-After,
+        without the hop-by-hop headers.
+    """
+    if body is None:
+        body = await request.body()
+    headers = {name: value for name, value in request.headers.items() if name not in HOP_HEADERS}
+    headers.update(shard_headers(request))
+
+    url = f"{shard_url}{path or request.url.path}"
+    if request.url.query:
+        url += f"?{request.url.query}"
+    async with session.request(request.method, url, data=body, headers=headers) as response:
+        relayed = Response(await response.read(), status_code=response.status)
+        for name, value in response.headers.items():
+            if name.lower() not in RESPONSE_SKIP_HEADERS:
+                # append keeps repeated headers such as Set-Cookie
+                relayed.headers.append(name, value)
+        return relayed
+
+
+async def fan_out(path: str, request: Request | None = None) -> list:
+    """
+    Sends the same GET request to every shard.
+
+    Args:
+        path (str): The path and query to request.
+        request (Request, optional): The client request, whose address the shards rate limit.
+
+    Returns:
+        list: The decoded JSON responses, in shard order.
+    """
+    headers = shard_headers(request)
+
+    async def fetch(shard_url):
+        async with session.get(f"{shard_url}{path}", headers=headers) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    return await asyncio.gather(*(fetch(shard_url) for shard_url in shard_urls.values()))
+
+
+async def with_id(request: Request) -> bytes:
+    """
+    Returns:
+        bytes: The JSON request body with an "id" added if it had none, so every shard
+        that receives it stores the object under the same ID.
+    """
+    data = await request.json()
+    if isinstance(data, dict):
+        data.setdefault("id", uuid4().hex)
+    return json.dumps(data).encode()
+
+
+@app.post("/create_lobby")
+async def create_lobby(request: Request):
+    """Creates a lobby on the shard its ID hashes to."""
+    body = await with_id(request)
+    return await forward(request, shard_for(json.loads(body).get("id", "")), body)
+
+
+@app.post("/create_player")
+async def create_player(request: Request):
+    """
+    Creates a player on the shard its ID hashes to.
+
+    The shard of a lobby fetches the player from there when it joins, see main.fetch_player.
+    """
+    body = await with_id(request)
+    return await forward(request, shard_for(json.loads(body).get("id", "")), body)
+
+
+async def read_ndjson_rows(request: Request) -> list:
+    """
+    Reads an NDJSON request body and adds an "id" to every object row, see with_id.
+
+    Returns:
+        list: Tuples of the input line number and the line, in input order.
+    """
+    rows = []
+    async for number, line in iter_ndjson_lines(request.stream()):
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        if isinstance(row, dict):
+            row.setdefault("id", uuid4().hex)
+            line = json.dumps(row).encode()
+        rows.append((number, line))
+    return rows
+
+
+async def post_ndjson(request: Request, shard_url: str, rows: list) -> list:
+    """
+    Sends rows to a bulk endpoint of a shard.
+
+    Returns:
+        list: The shard's result rows, numbered by the input line numbers of `rows`.
+
+    Raises:
+        HTTPException: With the shard's status code if the shard rejects the request.
+    """
+    headers = {"content-type": "application/x-ndjson", **shard_headers(request)}
+    body = b"\n".join(line for _, line in rows)
+    async with session.post(f"{shard_url}{request.url.path}", data=body, headers=headers) as response:
+        if response.status != 200:
+            raise HTTPException(status_code=response.status, detail=(await response.json()).get("detail"))
+        results = [json.loads(line) for line in (await response.text()).splitlines() if line]
+    # The shard numbers its own lines, map them back to the input line numbers
+    for result in results:
+        result["line"] = rows[result["line"] - 1][0]
+    return results
+
+
+def ndjson_response(results: list) -> Response:
+    return Response("".join(json.dumps(result) + "\n" for result in results),
+                    media_type="application/x-ndjson")
+
+
+@app.post("/players/bulk")
+@app.post("/lobbies/bulk")
+async def route_bulk(request: Request):
+    """
+    Creates many players or lobbies, each on the shard its ID hashes to.
+
+    The rows are split per shard and the shards' result rows are merged back into input order.
+    """
+    rows_by_shard = {shard_url: [] for shard_url in shard_urls.values()}
+    for number, line in await read_ndjson_rows(request):
+        try:
+            shard_url = shard_for(str(json.loads(line)["id"]))
+        except (ValueError, TypeError, KeyError):
+            # Invalid rows go anywhere, the shard reports the validation error
+            shard_url = next(iter(rows_by_shard))
+        rows_by_shard[shard_url].append((number, line))
+
+    results = await asyncio.gather(*(
+        post_ndjson(request, shard_url, rows) for shard_url, rows in rows_by_shard.items() if rows))
+    return ndjson_response(sorted((result for shard_results in results for result in shard_results),
+                                  key=lambda result: result["line"]))
+
+
+@app.api_route("/lobby/{lobby_id}/{action:path}", methods=["POST"])
+async def route_lobby(request: Request, lobby_id: str, action: str):
+    """Forwards joins and bot requests to the shard owning the lobby."""
+    return await forward(request, shard_for(lobby_id))
+
+
+@app.api_route("/status/{game_id}", methods=["GET"])
+@app.api_route("/guess/{game_id}/{user_id}/{char}", methods=["POST"])
+async def route_game(request: Request, game_id: str):
+    """Forwards status requests and guesses to the shard owning the game."""
+    return await forward(request, shard_for(game_id))
+
+
+@app.get("/lobbies")
+async def get_lobbies(request: Request):
+    """Retrieves the lobbies of all shards."""
+    return [lobby for shard_lobbies in await fan_out("/lobbies", request) for lobby in shard_lobbies]
+
+
+async def follow_lobbies(name: str):
+    """
+    Mirrors the lobby stream of one shard into the router's lobby_stream.
+
+    The shard starts with a snapshot of its lobbies, which replaces what the router knew
+    about them, followed by incremental events. When the stream ends the router resumes
+    it with Last-Event-ID, and the shard answers with the missed events or a new snapshot.
+    """
+    last_event_id = None
+    while name in shard_urls:
+        headers = shard_headers()
+        if last_event_id is not None:
+            headers["last-event-id"] = last_event_id
+        try:
+            async with session.get(f"{shard_urls[name]}/lobbies/stream", headers=headers,
+                                   timeout=aiohttp.ClientTimeout(total=None)) as response:
+                response.raise_for_status()
+                async for event_id, event, data in read_events(response.content):
+                    last_event_id = event_id
+                    apply_lobby_event(name, event, data)
+        except (aiohttp.ClientError, ValueError):
+            pass
+        await asyncio.sleep(FOLLOW_RETRY_DELAY)
+
+
+def apply_lobby_event(name: str, event: str, data):
+    """Updates the lobbies of a shard with one of its stream events and re-publishes it."""
+    lobbies = shard_lobbies.setdefault(name, {})
+    if event == "snapshot":
+        shard_lobbies[name] = {lobby["id"]: lobby for lobby in data}
+        pending_snapshots.discard(name)
+        # Publish one merged snapshot once all shards have reported, not a partial one per shard
+        if not pending_snapshots:
+            lobby_stream.publish("snapshot", lobby_stream.snapshot())
+        return
+    if event == "created":
+        lobbies[data["id"]] = data
+    elif data.get("lobby_id") in lobbies:
+        lobby = lobbies[data["lobby_id"]]
+        if event == "joined":
+            lobby["players"].append({"id": data["player_id"], "name": data["name"]})
+        elif event in ("closed", "expired"):
+            lobby["status"] = event
+    lobby_stream.publish(event, data)
+
+
+def follow_all_lobbies():
+    """(Re)starts following the lobby stream of every shard, e.g. after lobbies moved between shards."""
+    for follower in lobby_followers.values():
+        follower.cancel()
+    lobby_followers.clear()
+    pending_snapshots.update(shard_urls)
+    for name in shard_urls:
+        lobby_followers[name] = asyncio.create_task(follow_lobbies(name))
+
+
+@app.get("/lobbies/stream")
+async def stream_lobbies(request: Request):
+    """
+    Streams the lobby changes of all shards as Server-Sent Events, see main.stream_lobbies.
+
+    Event IDs are the router's own, so clients resume with Last-Event-ID as usual.
+    """
+    return StreamingResponse(
+        lobby_stream.subscribe(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.get("/games")
+async def get_games(request: Request):
+    """Retrieves the running games of all shards."""
+    return [game for shard_games in await fan_out("/games", request) for game in shard_games]
+
+
+@app.get("/players")
+async def get_players(request: Request):
+    """Retrieves all players. Shards also list the players who joined their lobbies, so duplicates are dropped."""
+    merged = {}
+    for shard_players in await fan_out("/players", request):
+        for player in shard_players:
+            merged.setdefault(player["id"], player)
+    return list(merged.values())
+
+
+@app.get("/history")
+async def get_history(request: Request, limit: int = 100):
+    """Retrieves the finished games of all shards, most recent first."""
+    query = f"?{request.url.query}" if request.url.query else ""
+    history = [game for shard_history in await fan_out(f"/history{query}", request) for game in shard_history]
+    history.sort(key=lambda game: game["finished_at"], reverse=True)
+    return history[:limit]
+
+
+@app.get("/leaderboard")
+async def get_leaderboard(request: Request, k: int = 10):
+    """
+    Retrieves the best players of all shards.
+
+    The statistics of a player whose games ran on several shards are summed from each
+    shard's top k, so players just outside every shard's top k can be missing.
+    """
+    merged = {}
+    for shard_top in await fan_out(f"/leaderboard?k={k}", request):
+        for entry in shard_top:
+            stats = merged.setdefault(entry["player_id"], {
+                "player_id": entry["player_id"], "name": entry["name"],
+                "games_played": 0, "wins": 0, "guesses": 0, "correct_guesses": 0,
+            })
+            for key in ("games_played", "wins", "guesses", "correct_guesses"):
+                stats[key] += entry[key]
+
+    ranked = sorted(merged.values(), key=lambda stats: (-stats["wins"], stats["games_played"]))[:k]
+    for rank, stats in enumerate(ranked, start=1):
+        stats["accuracy"] = stats["correct_guesses"] / stats["guesses"] if stats["guesses"] else 0.0
+        stats["rank"] = rank
+    return ranked
+
+
+async def get_player_stats_of_shards(request: Request, player_id: str) -> list:
+    """
+    Returns:
+        list: The statistics of a player on every shard where the player has played.
+    """
+    async def fetch(shard_url):
+        async with session.get(f"{shard_url}/players/{player_id}/stats",
+                               headers=shard_headers(request)) as response:
+            if response.status == 404:
+                return None
+            response.raise_for_status()
+            return await response.json()
+
+    results = await asyncio.gather(*(fetch(shard_url) for shard_url in shard_urls.values()))
+    return [stats for stats in results if stats is not None]
+
+
+@app.get("/players/{player_id}/stats")
+async def get_player_stats(request: Request, player_id: str):
+    """
+    Retrieves the statistics of a player, summed over all shards.
+
+    The rank is the player's position among the merged top players of the shards, so it
+    is approximate in the same way as /leaderboard.
+
+    Raises:
+        HTTPException(404): If the player has not played on any shard yet.
+    """
+    shard_stats = await get_player_stats_of_shards(request, player_id)
+    if not shard_stats:
+        raise HTTPException(
+            status_code=404, detail=f"No statistics for player with id: {player_id}")
+
+    stats = {"player_id": player_id, "name": shard_stats[0]["name"]}
+    for key in ("games_played", "wins", "guesses", "correct_guesses"):
+        stats[key] = sum(shard[key] for shard in shard_stats)
+    stats["accuracy"] = stats["correct_guesses"] / stats["guesses"] if stats["guesses"] else 0.0
+
+    # Everyone ranked above the player on a shard could be ranked above it overall
+    others = await get_leaderboard(request, k=max(shard["rank"] for shard in shard_stats))
+    key = (-stats["wins"], stats["games_played"], player_id)
+    stats["rank"] = 1 + sum(
+        (-other["wins"], other["games_played"], other["player_id"]) < key
+        for other in others if other["player_id"] != player_id
+    )
+    return stats
+
+
+def sum_counts(counts: list) -> dict:
+    """
+    Adds up count dictionaries key by key, including nested ones.
+
+    Example:
+        >>> sum_counts([{"dead": 1, "multiplexed": {"topics": 2}}, {"dead": 3, "multiplexed": {"topics": 1}}])
+        {'dead': 4, 'multiplexed': {'topics': 3}}
+    """
+    total = {}
+    for shard_counts in counts:
+        for key, value in shard_counts.items():
+            if isinstance(value, dict):
+                total[key] = sum_counts([total.get(key, {}), value])
+            else:
+                total[key] = total.get(key, 0) + value
+    return total
+
+
+@app.get("/events")
+async def get_event_counts(request: Request):
+    """Retrieves the number of published events per topic, summed over all shards."""
+    return sum_counts(await fan_out("/events", request))
+
+
+@app.get("/ws_stats")
+async def get_ws_stats(request: Request):
+    """
+    Retrieves the WebSocket connection counts of all shards.
+
+    Clients connected through the router are counted once per shard they reach.
+    """
+    return sum_counts(await fan_out("/ws_stats", request))
+
+
+@app.get("/shard_map")
+async def get_shard_map():
+    """
+    Retrieves the shards and their URLs, see main.get_shard_map.
+
+    Clients that hash IDs on this map call the owning shard directly instead of going
+    through the router, so the router does not cap their throughput.
+    """
+    return shard_urls
+
+
+@app.get("/shards")
+async def get_shards(request: Request):
+    """
+    Retrieves the shards and how many lobbies and games each one holds.
+
+    Example:
+        {"shard-0": {"url": "http://127.0.0.1:8001", "lobbies": 12, "games": 5}}
+    """
+    lobbies, games = await asyncio.gather(fan_out("/lobbies", request), fan_out("/games", request))
+    return {
+        name: {"url": url, "lobbies": len(shard_lobbies), "games": len(shard_games)}
+        for (name, url), shard_lobbies, shard_games in zip(shard_urls.items(), lobbies, games)
+    }
+
+
+@app.post("/shards")
+async def add_shard(name: str, url: str):
+    """
+    Adds a running worker as a new shard and rebalances.
+
+    Every shard hands off the players, lobbies and games whose IDs now hash to the new
+    shard. Everything else stays where it is.
+
+    Args:
+        name (str): The name of the new shard, as passed to the worker in HANGMAN_SHARD.
+        url (str): Base URL of the new shard.
+
+    Returns:
+        dict: The number of lobbies and games moved off each existing shard.
+
+    Raises:
+        HTTPException(400): If the URL is not a shard of this name started with HANGMAN_SHARD_SECRET.
+        HTTPException(409): If a shard with this name already exists.
+    """
+    if name in shard_urls:
+        raise HTTPException(status_code=409, detail=f"Shard {name} already exists.")
+    if urlsplit(url).scheme not in ("http", "https") or not urlsplit(url).netloc:
+        raise HTTPException(status_code=400, detail="The shard URL must be an http(s) URL.")
+    url = url.rstrip("/")
+    try:
+        async with session.get(f"{url}/internal/shard", headers=shard_headers()) as response:
+            identity = await response.json() if response.status == 200 else {}
+    except (aiohttp.ClientError, ValueError):
+        identity = {}
+    if identity.get("name") != name:
+        raise HTTPException(
+            status_code=400, detail=f"{url} is not shard {name}, or it does not share the shard secret.")
+
+    previous = dict(shard_urls)
+    shard_urls[name] = url
+    hash_ring.add_node(name)
+
+    async def rebalance(shard_url):
+        async with session.post(f"{shard_url}/internal/rebalance", json=shard_urls,
+                                headers=shard_headers()) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    # The new shard must know the shard map too, it owns its keys from now on
+    await rebalance(url)
+    moved = await asyncio.gather(*(rebalance(shard_url) for shard_url in previous.values()))
+    # Moved lobbies leave one shard's stream and join another's without events, so start over
+    follow_all_lobbies()
+    return dict(zip(previous, moved))
+
+
+@app.api_route("/shards/{name}/{path:path}", methods=["GET", "POST", "DELETE"])
+async def route_shard(request: Request, name: str, path: str):
+    """
+    Forwards per-process endpoints, e.g. /shards/shard-0/admin/memory, to one shard.
+
+    Raises:
+        HTTPException(404): If the shard is unknown or the path is one of the /internal
+            endpoints, which only the router and the shards may call.
+    """
+    path = posixpath.normpath("/" + path.lstrip("/"))
+    if name not in shard_urls or path.split("/")[1] == "internal":
+        raise HTTPException(status_code=404, detail=f"Not found: /shards/{name}{path}")
+    return await forward(request, shard_urls[name], path=path)
+
+
+@app.websocket("/multicast/{lobby_id}")
+async def proxy_multicast(websocket: WebSocket, lobby_id: str):
+    """
+    Proxies the lobby WebSocket to the shard owning the lobby.
+
+    Messages are relayed in both directions until either side closes. When the shard
+    closes the connection, e.g. with 1012 after the lobby moved, the close code is passed on.
+    """
+    await websocket.accept()
+    shard_url = shard_for(lobby_id).replace("http", "ws", 1)
+    try:
+        upstream = await session.ws_connect(f"{shard_url}/multicast/{lobby_id}", heartbeat=None)
+    except aiohttp.ClientError:
+        await websocket.close(code=1011)
+        return
+
+    async def client_to_shard():
+        try:
+            while True:
+                await upstream.send_str(await websocket.receive_text())
+        except WebSocketDisconnect:
+            pass
+
+    async def shard_to_client():
+        async for message in upstream:
+            if message.type == aiohttp.WSMsgType.TEXT:
+                await websocket.send_text(message.data)
+        await websocket.close(code=upstream.close_code or 1000)
+
+    tasks = [asyncio.create_task(client_to_shard()), asyncio.create_task(shard_to_client())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await upstream.close()
+
+
+@app.websocket("/ws")
+async def proxy_multiplexed(websocket: WebSocket):
+    """
+    Proxies a multiplexed WebSocket to the shards owning its topics.
+
+    The router opens at most one connection per shard for each client, the first time
+    the client subscribes to a topic on that shard, and relays the events of all of them
+    to the client. The router answers the heartbeats of the shard connections and runs
+    its own heartbeat toward the client, closing it after HEARTBEAT_TIMEOUT seconds of
+    silence. When a shard reports a topic as moved after a rebalance, it is subscribed
+    on the new owner.
+    """
+    await websocket.accept()
+    loop = asyncio.get_running_loop()
+    last_seen = loop.time()
+    # Shard URL -> task opening the connection, so concurrent subscribes share one connection
+    upstreams = {}
+    pumps = set()
+
+    async def shard_to_client(upstream):
+        async for message in upstream:
+            if message.type != aiohttp.WSMsgType.TEXT:
+                continue
+            try:
+                frame = json.loads(message.data)
+            except ValueError:
+                continue
+            if isinstance(frame, dict) and frame.get("type") == PING_MESSAGE["type"]:
+                await upstream.send_json({"type": PONG_TYPE})
+            elif isinstance(frame, dict) and frame.get("op") == "moved":
+                await send_to_owner({"op": "subscribe", "topic": frame["topic"]})
+            else:
+                await websocket.send_text(message.data)
+
+    async def connect(shard_url):
+        upstream = await session.ws_connect(f"{shard_url.replace('http', 'ws', 1)}/ws", heartbeat=None)
+        pumps.add(asyncio.create_task(shard_to_client(upstream)))
+        return upstream
+
+    async def send_to_owner(frame: dict):
+        parsed = parse_topic(frame.get("topic"))
+        shard_url = shard_for(parsed[1] if parsed else "")
+        if shard_url not in upstreams:
+            upstreams[shard_url] = asyncio.create_task(connect(shard_url))
+        try:
+            upstream = await upstreams[shard_url]
+        except aiohttp.ClientError:
+            # Let the next subscribe try again
+            upstreams.pop(shard_url, None)
+            raise
+        await upstream.send_json(frame)
+
+    async def client_to_shards():
+        nonlocal last_seen
+        try:
+            while True:
+                text = await websocket.receive_text()
+                last_seen = loop.time()
+                try:
+                    frame = json.loads(text)
+                except ValueError:
+                    continue
+                # Pongs and other frames without an op are meant for the router itself
+                if isinstance(frame, dict) and "op" in frame:
+                    await send_to_owner(frame)
+        except (WebSocketDisconnect, aiohttp.ClientError):
+            pass
+
+    async def heartbeat():
+        try:
+            while loop.time() - last_seen < HEARTBEAT_TIMEOUT:
+                await websocket.send_json(PING_MESSAGE)
+                await asyncio.sleep(HEARTBEAT_INTERVAL)
+            await websocket.close()
+        except Exception:
+            # The client is gone already
+            pass
+
+    tasks = [asyncio.create_task(client_to_shards()), asyncio.create_task(heartbeat())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks + list(pumps):
+            task.cancel()
+        for pending in upstreams.values():
+            if pending.done() and not pending.cancelled() and pending.exception() is None:
+                await pending.result().close()
+            else:
+                pending.cancel()
+
+
+def start_shards(count: int, host: str, base_port: int) -> list:
+    """
+    Starts `count` server processes, each owning a part of the hash ring.
+
+    Returns:
+        list: The started processes.
+    """
+    urls = {f"shard-{i}": f"http://{host}:{base_port + i}" for i in range(count)}
+    shard_urls.update(urls)
+    for name in urls:
+        hash_ring.add_node(name)
+
+    processes = []
+    for i, name in enumerate(urls):
+        env = dict(os.environ, HANGMAN_SHARD=name, HANGMAN_SHARDS=json.dumps(urls),
+                   HANGMAN_SHARD_SECRET=SHARD_SECRET)
+        processes.append(subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", host, "--port", str(base_port + i),
+             "--log-level", "warning"],
+            env=env,
+        ))
+    return processes
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Runs hangman shards behind a routing front end")
+    parser.add_argument("--shards", type=int, default=2, help="Number of shard processes to start")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface of the router and the shards")
+    parser.add_argument("--port", type=int, default=8000, help="Port of the router")
+    parser.add_argument("--base-port", type=int, default=8001, help="Port of the first shard")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    shard_processes = start_shards(args.shards, args.host, args.base_port)
+    # Exit through the finally block on SIGTERM too, so the shards do not outlive the router
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    finally:
+        for process in shard_processes:
+            process.terminate()
+        for process in shard_processes:
+            process.wait()
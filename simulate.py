@@ -0,0 +1,180 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from string import ascii_lowercase
+
+from utils.game_engine import ELIMINATED, WON, GameState
+from utils.solver import BotPlayer, HangmanSolver
+
+# Games simulated per work unit. Every chunk gets its own seed, so the results only
+# depend on --seed and --games, not on the number of worker processes.
+CHUNK_SIZE = 10000
+
+
+def load_words(file_path: str = "words.txt") -> list:
+    """
+    Reads the word list used by the server.
+
+    Args:
+        file_path (str): Path to the word list. Default is 'words.txt'.
+
+    Returns:
+        list: The non-empty lines of the file.
+    """
+    with open(file_path, "r") as file:
+        return [word for word in file.read().splitlines() if word]
+
+
+def simulate_chunk(seed: int, chunk: int, games: int, players: int, max_attempts: int, words: list) -> dict:
+    """
+    Plays `games` games with players guessing letters in random orders.
+
+    Args:
+        seed (int): The base seed of the run.
+        chunk (int): The index of this chunk, mixed into the seed.
+        games (int): Number of games to play.
+        players (int): Players per game.
+        max_attempts (int): Lives of every player.
+        words (list): The words to pick from.
+
+    Returns:
+        dict: Counters of games, moves, won games and eliminations.
+    """
+    rng = random.Random(seed * 1000003 + chunk)
+    alphabet = sorted(set(ascii_lowercase).union(*words))
+    player_ids = [f"player-{i}" for i in range(players)]
+    # Shuffling per game would dominate the run time, so players draw from a fixed pool of orders
+    guess_orders = [rng.sample(alphabet, len(alphabet)) for _ in range(256)]
+    moves = wins = eliminations = 0
+
+    for _ in range(games):
+        game = GameState(rng.choice(words), player_ids, max_attempts)
+        orders = {player_id: iter(rng.choice(guess_orders)) for player_id in player_ids}
+
+        while game.status == "open":
+            player_id = game.players[0]
+            outcome = game.guess(player_id, next(orders[player_id], "-"))
+            moves += 1
+            if outcome == WON:
+                wins += 1
+            elif outcome == ELIMINATED:
+                eliminations += 1
+
+    return {"games": games, "moves": moves, "wins": wins, "eliminations": eliminations}
+
+
+def run(games: int, players: int, seed: int, workers: int, max_attempts: int = 6,
+        words_path: str = "words.txt") -> dict:
+    """
+    Simulates games in-process, or across a process pool if `workers` > 1.
+
+    Returns:
+        dict: The summed counters, plus the elapsed time, games per second and
+        nanoseconds per move.
+    """
+    words = load_words(words_path)
+    sizes = [min(CHUNK_SIZE, games - start) for start in range(0, games, CHUNK_SIZE)]
+    args = [(seed, chunk, size, players, max_attempts, words) for chunk, size in enumerate(sizes)]
+
+    start = time.perf_counter()
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(simulate_chunk, *zip(*args)))
+    else:
+        results = [simulate_chunk(*chunk_args) for chunk_args in args]
+    elapsed = time.perf_counter() - start
+
+    totals = {key: sum(result[key] for result in results) for key in ("games", "moves", "wins", "eliminations")}
+    totals["elapsed"] = elapsed
+    totals["games_per_second"] = totals["games"] / elapsed if elapsed else 0.0
+    totals["ns_per_move"] = elapsed / totals["moves"] * 1e9 if totals["moves"] else 0.0
+    return totals
+
+
+def synthetic_words(count: int, words: list, seed: int = 0) -> list:
+    """
+    Generates a large random corpus with the letter frequencies and word lengths of `words`.
+
+    Args:
+        count (int): Number of distinct words to generate.
+        words (list): The words to take letter frequencies and lengths from.
+        seed (int): Seed of the generator.
+
+    Returns:
+        list: `count` distinct words.
+    """
+    rng = random.Random(seed)
+    letters = "".join(words)
+    lengths = [len(word) for word in words]
+    generated = set()
+    while len(generated) < count:
+        generated.add("".join(rng.choices(letters, k=rng.choice(lengths))))
+    return sorted(generated)
+
+
+def benchmark_solver(words: list, games: int, seed: int = 0) -> dict:
+    """
+    Times every move of bots solving random words from the corpus.
+
+    Returns:
+        dict: The number of moves and the mean, 99th percentile and maximum
+        milliseconds per move.
+    """
+    rng = random.Random(seed)
+    solver = HangmanSolver(words)
+    timings = []
+
+    for _ in range(games):
+        word = rng.choice(words)
+        bot = BotPlayer(solver)
+        game = GameState(word, ["bot"], max_attempts=len(solver.alphabet))
+        while game.status == "open":
+            start = time.perf_counter()
+            char = bot.choose(game.word_status, game.guessed_chars)
+            timings.append(time.perf_counter() - start)
+            if char is None:
+                break
+            game.guess("bot", char)
+            bot.record(char, game.guessed_chars)
+
+    timings.sort()
+    return {
+        "moves": len(timings),
+        "mean_ms": sum(timings) / len(timings) * 1e3,
+        "p99_ms": timings[int(len(timings) * 0.99)] * 1e3,
+        "max_ms": timings[-1] * 1e3,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless hangman simulation for benchmarking the rule engine")
+    parser.add_argument("--games", type=int, default=100000, help="Number of games to play")
+    parser.add_argument("--players", type=int, default=2, help="Players per game")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the run")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes, 1 to run in-process")
+    parser.add_argument("--max-attempts", type=int, default=6, help="Lives of every player")
+    parser.add_argument("--words", default="words.txt", help="Word list")
+    parser.add_argument("--solver", action="store_true", help="Time the bot solver instead of the rule engine")
+    parser.add_argument("--synthetic", type=int, default=0,
+                        help="Benchmark the solver on this many generated words instead of the word list")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.solver:
+        words = load_words(args.words)
+        if args.synthetic:
+            words = synthetic_words(args.synthetic, words, args.seed)
+        timings = benchmark_solver(words, args.games, args.seed)
+        print(f"Words: {len(words)}, moves: {timings['moves']}")
+        print(f"Per move: mean {timings['mean_ms']:.3f} ms, p99 {timings['p99_ms']:.3f} ms, "
+              f"max {timings['max_ms']:.3f} ms")
+        raise SystemExit
+
+    totals = run(args.games, args.players, args.seed, args.workers, args.max_attempts, args.words)
+    print(f"Games: {totals['games']}, moves: {totals['moves']}, "
+          f"won: {totals['wins']}, eliminations: {totals['eliminations']}")
+    print(f"Elapsed: {totals['elapsed']:.2f}s, {totals['games_per_second']:.0f} games/s, "
+          f"{totals['ns_per_move']:.0f} ns/move")
@@ -0,0 +1,49 @@
+import bisect
+import random
+
+import pytest
+
+from utils.leaderboard import Leaderboard, OrderStatisticTree
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_tree_matches_sorted_list(seed):
+    rng = random.Random(seed)
+    tree = OrderStatisticTree()
+    keys = []
+
+    for _ in range(2000):
+        key = (rng.randint(-20, 0), rng.randint(0, 20), str(rng.randint(0, 50)))
+        if key in keys:
+            tree.remove(key)
+            keys.remove(key)
+        else:
+            tree.insert(key)
+            bisect.insort(keys, key)
+        # Removing a missing key is a no-op
+        tree.remove((1, 0, ""))
+
+        assert len(tree) == len(keys)
+        probe = (rng.randint(-21, 1), rng.randint(-1, 21), str(rng.randint(0, 50)))
+        assert tree.rank(probe) == bisect.bisect_left(keys, probe)
+        k = rng.randint(0, len(keys) + 2)
+        assert list(tree.first(k)) == keys[:k]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_leaderboard_matches_sorted_stats(seed):
+    rng = random.Random(seed)
+    board = Leaderboard()
+    players = [f"player-{i}" for i in range(40)]
+
+    for _ in range(500):
+        player_id = rng.choice(players)
+        if rng.random() < 0.5:
+            board.record_guess(player_id, player_id, rng.random() < 0.5)
+        else:
+            board.record_game_end(player_id, player_id, rng.random() < 0.3)
+
+    ordered = sorted(board.stats.values(), key=lambda s: (-s.wins, s.games_played, s.player_id))
+    assert board.top(len(ordered) + 1) == ordered
+    for rank, stats in enumerate(ordered, start=1):
+        assert board.rank(stats.player_id) == rank
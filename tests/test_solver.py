@@ -0,0 +1,91 @@
+import random
+
+import numpy as np
+import pytest
+
+from utils.solver import DENSE_COUNT_MIN, HIDDEN_CHAR, HangmanSolver
+
+# A small alphabet keeps many words consistent with a game, so both the dense and
+# the gathered code paths are exercised.
+ALPHABET = "abcdefg"
+
+
+def random_words(rng, count, lengths):
+    return ["".join(rng.choice(ALPHABET) for _ in range(rng.choice(lengths))) for _ in range(count)]
+
+
+def random_state(rng, word):
+    """Builds the masked word and the tried characters for a random set of guesses."""
+    tried = rng.sample(ALPHABET, rng.randint(0, len(ALPHABET) - 1))
+    guessed = [char for char in tried if char in word]
+    missed = [char for char in tried if char not in word]
+    status = "".join(char if char in guessed else HIDDEN_CHAR for char in word)
+    return status, guessed, missed
+
+
+def brute_force(words, status, guessed, missed):
+    tried = set(guessed) | set(missed) | set(status) - {HIDDEN_CHAR}
+    return [
+        word for word in words
+        if len(word) == len(status) and all(
+            char == shown if shown != HIDDEN_CHAR else char not in tried
+            for char, shown in zip(word, status)
+        )
+    ]
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("lengths", [(3, 5, 8), (9, 16), (30, 64)])
+def test_filter_candidates_matches_brute_force(seed, lengths):
+    rng = random.Random(seed)
+    words = random_words(rng, 3000, lengths)
+    solver = HangmanSolver(words)
+
+    for _ in range(50):
+        status, guessed, missed = random_state(rng, rng.choice(words))
+        bucket = solver.buckets[len(status)]
+        found = solver.filter_candidates(status, guessed, missed)
+        assert sorted(bucket.words[i] for i in found) == sorted(set(brute_force(words, status, guessed, missed)))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_next_guess_narrows_like_brute_force(seed):
+    rng = random.Random(seed)
+    words = random_words(rng, DENSE_COUNT_MIN * 3, (6,))
+    solver = HangmanSolver(words)
+    unique_words = sorted(set(words))
+
+    secret = rng.choice(words)
+    guessed, missed, candidates = [], [], None
+    while True:
+        status = "".join(char if char in guessed else HIDDEN_CHAR for char in secret)
+        char, candidates = solver.next_guess(status, guessed, missed, candidates)
+        if char is None:
+            break
+
+        expected = brute_force(unique_words, status, guessed, missed)
+        assert sorted(solver.buckets[6].words[i] for i in candidates) == expected
+
+        # The guess is an untried letter occurring in the most remaining candidates
+        tried = set(guessed) | set(missed)
+        counts = {letter: sum(letter in word for word in expected)
+                  for letter in ALPHABET if letter not in tried}
+        assert char not in tried
+        assert counts[char] == max(counts.values())
+
+        (guessed if char in secret else missed).append(char)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_count_letters_matches_brute_force(seed):
+    rng = random.Random(seed)
+    words = sorted(set(random_words(rng, DENSE_COUNT_MIN * 3, (7,))))
+    solver = HangmanSolver(words)
+    bucket = solver.buckets[7]
+
+    # Sizes on both sides of the popcount threshold
+    for size in (0, 1, 63, 64, 65, DENSE_COUNT_MIN - 1, DENSE_COUNT_MIN, len(bucket)):
+        candidates = np.array(sorted(rng.sample(range(len(bucket)), size)), dtype=np.intp)
+        counts = bucket.count_letters(candidates)
+        for letter, count in zip(solver.alphabet, counts):
+            assert count == sum(letter in bucket.words[i] for i in candidates)
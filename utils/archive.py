@@ -0,0 +1,371 @@
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional
+
+OUTCOME_WON = 0
+OUTCOME_LOST = 1
+OUTCOMES = {OUTCOME_WON: "won", OUTCOME_LOST: "lost"}
+
+# Column name -> array typecode. The order is also the order on disk.
+COLUMNS = {
+    "game_ids": "B",       # 16 raw bytes per game, the uuid4 hex ID decoded
+    "finished_at": "d",    # Unix timestamp
+    "words": "I",          # index into the interned words
+    "winners": "i",        # index into the interned player IDs, -1 if nobody won
+    "outcomes": "B",       # OUTCOME_WON or OUTCOME_LOST
+    "guesses": "B",        # number of correctly guessed characters
+    "player_offsets": "I", # start of the players of game i in `players`, one extra trailing entry
+    "players": "I",        # interned player IDs of all games, back to back
+}
+
+HEADER = struct.Struct("<4sI")
+MAGIC = b"HGA1"
+
+
+def new_segment() -> Dict[str, array]:
+    """
+    Returns:
+        dict: Empty in-memory columns of a segment.
+    """
+    segment = {name: array(typecode) for name, typecode in COLUMNS.items()}
+    segment["player_offsets"].append(0)
+    return segment
+
+
+def segment_length(segment: dict) -> int:
+    return len(segment["finished_at"])
+
+
+class GameArchive:
+    """
+    A compact, column-oriented store of finished games.
+
+    Every column is a flat array, player IDs and words are interned to integers, and
+    game IDs are kept as 16 raw bytes. An archived game costs a few dozen bytes instead
+    of a full GameModel with its player list and guess history.
+
+    Games are appended in the order they finish, so `finished_at` is sorted and time
+    ranges are found with a binary search.
+
+    The archive file is a sequence of segments, each a header, a JSON block and the
+    columns of some games. Saved segments are memory-mapped read-only; new games go to
+    an in-memory tail that `flush` appends to the file as a new segment and maps in
+    turn, so the heap only holds the games finished since the last flush. `save`
+    rewrites the file as a single segment.
+    """
+
+    def __init__(self):
+        # Read-only segments mapped from the file, then the in-memory tail
+        self.segments: List[dict] = []
+        self.row_starts: List[int] = []
+        self.tail = new_segment()
+        self.player_ids: List[str] = []
+        self.player_index: Dict[str, int] = {}
+        self.words: List[str] = []
+        self.word_index: Dict[str, int] = {}
+        # Interned strings already written to the file, and the end of its last complete segment
+        self._saved_players = 0
+        self._saved_words = 0
+        self._file_size = 0
+        self._maps: List[mmap.mmap] = []
+
+    def __len__(self) -> int:
+        return self._mapped_rows() + segment_length(self.tail)
+
+    def pending(self) -> int:
+        """
+        Returns:
+            int: The number of games not written to the file yet.
+        """
+        return segment_length(self.tail)
+
+    def _mapped_rows(self) -> int:
+        if not self.segments:
+            return 0
+        return self.row_starts[-1] + segment_length(self.segments[-1])
+
+    def nbytes(self) -> int:
+        """
+        Returns:
+            int: The bytes held by the columns, whether in memory or memory-mapped.
+        """
+        return sum(
+            column.nbytes if isinstance(column, memoryview) else len(column) * column.itemsize
+            for segment in self.segments + [self.tail] for column in segment.values()
+        )
+
+    def _intern_player(self, player_id: str) -> int:
+        index = self.player_index.get(player_id)
+        if index is None:
+            index = len(self.player_ids)
+            self.player_ids.append(player_id)
+            self.player_index[player_id] = index
+        return index
+
+    def _intern_word(self, word: str) -> int:
+        index = self.word_index.get(word)
+        if index is None:
+            index = len(self.words)
+            self.words.append(word)
+            self.word_index[word] = index
+        return index
+
+    def append(self, game_id: str, word: str, player_ids: Iterable[str], winner: Optional[str],
+               guesses: int, finished_at: float):
+        """
+        Archives a finished game in the in-memory tail.
+
+        Args:
+            game_id (str): The uuid4 hex ID of the game.
+            word (str): The word of the game.
+            player_ids (Iterable[str]): IDs of everybody who took part.
+            winner (str, optional): ID of the winner, None if every player was eliminated.
+            guesses (int): Number of correctly guessed characters.
+            finished_at (float): Unix timestamp of the end of the game.
+        """
+        columns = self.tail
+
+        columns["game_ids"].frombytes(bytes.fromhex(game_id))
+        columns["finished_at"].append(finished_at)
+        columns["words"].append(self._intern_word(word))
+        columns["winners"].append(self._intern_player(winner) if winner else -1)
+        columns["outcomes"].append(OUTCOME_WON if winner else OUTCOME_LOST)
+        columns["guesses"].append(min(guesses, 255))
+        columns["players"].extend(self._intern_player(player_id) for player_id in player_ids)
+        columns["player_offsets"].append(len(columns["players"]))
+
+    def _get(self, columns: dict, row: int) -> dict:
+        start, end = columns["player_offsets"][row], columns["player_offsets"][row + 1]
+        winner = columns["winners"][row]
+        return {
+            "id": bytes(columns["game_ids"][row * 16:(row + 1) * 16]).hex(),
+            "word": self.words[columns["words"][row]],
+            "players": [self.player_ids[index] for index in columns["players"][start:end]],
+            "winner": self.player_ids[winner] if winner >= 0 else None,
+            "outcome": OUTCOMES[columns["outcomes"][row]],
+            "guesses": columns["guesses"][row],
+            "finished_at": columns["finished_at"][row],
+        }
+
+    def get(self, row: int) -> dict:
+        """
+        Returns:
+            dict: The archived game at `row`, with IDs and the word resolved.
+        """
+        mapped_rows = self._mapped_rows()
+        if row >= mapped_rows:
+            return self._get(self.tail, row - mapped_rows)
+        index = bisect_right(self.row_starts, row) - 1
+        return self._get(self.segments[index], row - self.row_starts[index])
+
+    def query(self, player_id: Optional[str] = None, winner: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              limit: int = 100) -> List[dict]:
+        """
+        Finds archived games, most recent first.
+
+        Args:
+            player_id (str, optional): Only games this player took part in.
+            winner (str, optional): Only games this player won.
+            since (float, optional): Only games finished at or after this Unix timestamp.
+            until (float, optional): Only games finished at or before this Unix timestamp.
+            limit (int): Maximum number of games to return.
+
+        Returns:
+            List[dict]: The matching games.
+        """
+        player = winner_index = None
+        if player_id is not None:
+            player = self.player_index.get(player_id)
+            if player is None:
+                return []
+        if winner is not None:
+            winner_index = self.player_index.get(winner)
+            if winner_index is None:
+                return []
+
+        found = []
+        # The tail holds the most recent games, then the segments from newest to oldest
+        for columns in [self.tail] + self.segments[::-1]:
+            finished_at = columns["finished_at"]
+            if not len(finished_at):
+                continue
+            if since is not None and finished_at[-1] < since:
+                # Every older segment ended before `since` too
+                break
+            low = bisect_left(finished_at, since) if since is not None else 0
+            high = bisect_right(finished_at, until) if until is not None else len(finished_at)
+
+            offsets, game_players, winners = columns["player_offsets"], columns["players"], columns["winners"]
+            for row in range(high - 1, low - 1, -1):
+                if len(found) >= limit:
+                    return found
+                if winner_index is not None and winners[row] != winner_index:
+                    continue
+                if player is not None and player not in game_players[offsets[row]:offsets[row + 1]]:
+                    continue
+                found.append(self._get(columns, row))
+        return found
+
+    @staticmethod
+    def _write_segment(file, player_ids: List[str], words: List[str], columns: Iterable[tuple]) -> dict:
+        """
+        Writes one segment at the end of `file`.
+
+        Args:
+            file: A binary file open for writing, positioned at its end.
+            player_ids (List[str]): The player IDs interned since the previous segment.
+            words (List[str]): The words interned since the previous segment.
+            columns (Iterable[tuple]): (name, length, chunks) for every column in COLUMNS order,
+                where chunks are the buffers holding its values.
+
+        Returns:
+            dict: Column name -> (file position, length) of the written columns.
+        """
+        columns = list(columns)
+        meta = json.dumps({
+            "player_ids": player_ids,
+            "words": words,
+            "lengths": {name: length for name, length, _ in columns},
+        }).encode()
+        # Segments and columns are aligned to 8 bytes so they can be cast in place
+        file.write(b"\0" * (-file.tell() % 8))
+        file.write(HEADER.pack(MAGIC, len(meta)))
+        file.write(meta)
+        positions = {}
+        for name, length, chunks in columns:
+            file.write(b"\0" * (-file.tell() % 8))
+            positions[name] = (file.tell(), length)
+            for chunk in chunks:
+                file.write(chunk)
+        return positions
+
+    def flush(self, path: str):
+        """
+        Appends the in-memory tail to the file as a new segment and maps it.
+
+        A partly written segment left by a crash is cut off first, so the file always
+        holds complete segments.
+        """
+        if not self.pending():
+            return
+        tail = self.tail
+        mode = "r+b" if os.path.exists(path) else "w+b"
+        with open(path, mode) as file:
+            file.truncate(self._file_size)
+            file.seek(self._file_size)
+            positions = self._write_segment(
+                file, self.player_ids[self._saved_players:], self.words[self._saved_words:],
+                ((name, len(tail[name]), [tail[name]]) for name in COLUMNS),
+            )
+            file.flush()
+            os.fsync(file.fileno())
+            file_size = file.tell()
+
+            # Map only the new segment; the offset of a map must be a multiple of the granularity
+            start = self._file_size - self._file_size % mmap.ALLOCATIONGRANULARITY
+            segment_map = mmap.mmap(file.fileno(), file_size - start, access=mmap.ACCESS_READ, offset=start)
+        view = memoryview(segment_map)
+        self._maps.append(segment_map)
+        self.row_starts.append(self._mapped_rows())
+        self.segments.append({
+            name: view[position - start:position - start + length * tail[name].itemsize].cast(COLUMNS[name])
+            for name, (position, length) in positions.items()
+        })
+        self._saved_players, self._saved_words = len(self.player_ids), len(self.words)
+        self._file_size = file_size
+        self.tail = new_segment()
+
+    def save(self, path: str):
+        """
+        Writes the whole archive to `path` as a single segment, e.g. on shutdown.
+
+        Every flush adds a segment, so this compacts the file again.
+        """
+        segments = self.segments + [self.tail]
+
+        def offsets():
+            # Player offsets continue from one segment to the next
+            base = 0
+            yield array("I", [0])
+            for segment in segments:
+                yield array("I", (offset + base for offset in segment["player_offsets"][1:]))
+                base += len(segment["players"])
+
+        columns = [
+            (name, len(self) + 1, offsets()) if name == "player_offsets" else
+            (name, sum(len(segment[name]) for segment in segments), [segment[name] for segment in segments])
+            for name in COLUMNS
+        ]
+        # Write next to the target and swap, the target is mapped by this archive
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            self._write_segment(file, self.player_ids, self.words, columns)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def open(cls, path: str) -> "GameArchive":
+        """
+        Opens a saved archive by memory-mapping the columns of its segments.
+
+        An incomplete last segment, e.g. after a crash during a flush, is ignored.
+
+        Raises:
+            ValueError: If the file is not a game archive.
+        """
+        archive = cls()
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return archive
+            file_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        archive._maps.append(file_map)
+        view = memoryview(file_map)
+
+        position = 0
+        while True:
+            position += -position % 8
+            if position + HEADER.size > len(file_map):
+                break
+            magic, meta_length = HEADER.unpack_from(file_map, position)
+            if magic != MAGIC:
+                if not archive.segments:
+                    archive.close()
+                    raise ValueError(f"'{path}' is not a game archive.")
+                break
+            try:
+                meta = json.loads(file_map[position + HEADER.size:position + HEADER.size + meta_length])
+            except ValueError:
+                break
+            position += HEADER.size + meta_length
+
+            segment = {}
+            for name, typecode in COLUMNS.items():
+                position += -position % 8
+                size = meta["lengths"][name] * array(typecode).itemsize
+                if position + size > len(file_map):
+                    break
+                segment[name] = view[position:position + size].cast(typecode)
+                position += size
+            if len(segment) < len(COLUMNS):
+                break
+
+            for player_id in meta["player_ids"]:
+                archive._intern_player(player_id)
+            for word in meta["words"]:
+                archive._intern_word(word)
+            archive.row_starts.append(archive._mapped_rows())
+            archive.segments.append(segment)
+            archive._file_size = position
+
+        archive._saved_players, archive._saved_words = len(archive.player_ids), len(archive.words)
+        return archive
+
+    def close(self):
+        """Drops the memory-mapped segments. The maps are released once no view uses them."""
+        self.segments = []
+        self.row_starts = []
+        self._maps = []
@@ -3,12 +3,12 @@ from fastapi import HTTPException
 from models.game_models import GameModel, LobbyModel, PlayerModel
 
 
-def get_player_by_id(db: list, player_id: str) -> PlayerModel:
+def get_player_by_id(db: dict, player_id: str) -> PlayerModel:
 
     """Gets a player by their ID.
 
     Args:
-    db: A list of PlayerModel objects.
+    db: A dict mapping player IDs to PlayerModel objects.
     player_id: The ID of the player to get.
 
     Returns:
@@ -18,9 +18,8 @@ def get_player_by_id(db: list, player_id: str) -> PlayerModel:
     HTTPException: If the player is not found.
     """
 
-    for player in db:
-        if player.id == player_id:
-            return player
+    if player_id in db:
+        return db[player_id]
 
     raise HTTPException(
         status_code=404, detail=f"Player Not Found with id: {player_id}")
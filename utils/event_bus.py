@@ -0,0 +1,77 @@
+import asyncio
+from collections import defaultdict, deque
+from typing import Awaitable, Callable, Deque, Dict, List
+
+from models.event_models import EventModel
+
+ALL_TOPICS = "*"
+
+Handler = Callable[[EventModel], Awaitable[None]]
+
+
+class EventBus:
+    """
+    An in-process, topic-based publish/subscribe bus.
+
+    Publishers do not know who consumes their events: HTTP handlers publish what
+    happened, and subscribers such as WebSocket channels, metrics or persistence react.
+    Handlers are awaited in subscription order, so every subscriber sees the events
+    of a topic in publishing order. An event published by a handler is delivered once
+    the current event has reached every handler, so all subscribers see causes before
+    their effects (lobby.full before game.started). A failing handler is logged and
+    does not stop the others.
+
+    Example:
+        >>> bus = EventBus()
+        >>> bus.subscribe(LobbyFullEvent.topic, start_game)
+        >>> await bus.publish(LobbyFullEvent(lobby_id="lobby1"))
+    """
+
+    def __init__(self):
+        self.handlers: Dict[str, List[Handler]] = defaultdict(list)
+        # Events published by handlers, per task that is currently delivering events
+        self._pending: Dict[asyncio.Task, Deque[EventModel]] = {}
+
+    def subscribe(self, topic: str, handler: Handler):
+        """
+        Registers a handler for a topic, or for every topic with "*".
+
+        Args:
+            topic (str): The topic, e.g. "game.finished".
+            handler (callable): Coroutine function called with each event of the topic.
+        """
+        self.handlers[topic].append(handler)
+
+    def unsubscribe(self, topic: str, handler: Handler):
+        """Removes a handler. Unknown handlers are ignored."""
+        if handler in self.handlers.get(topic, []):
+            self.handlers[topic].remove(handler)
+
+    async def publish(self, event: EventModel):
+        """
+        Delivers an event to the handlers of its topic, then to the "*" handlers.
+
+        Returns once the event and every event its handlers published were delivered.
+
+        Args:
+            event (EventModel): The event to publish.
+        """
+        task = asyncio.current_task()
+        if task in self._pending:
+            # Published by a handler: the outer publish delivers it next
+            self._pending[task].append(event)
+            return
+
+        pending = self._pending[task] = deque([event])
+        try:
+            while pending:
+                await self._deliver(pending.popleft())
+        finally:
+            del self._pending[task]
+
+    async def _deliver(self, event: EventModel):
+        for handler in self.handlers.get(event.topic, []) + self.handlers.get(ALL_TOPICS, []):
+            try:
+                await handler(event)
+            except Exception as e:
+                print(f"Event handler {handler.__name__} failed for {event.topic}: {str(e)}")
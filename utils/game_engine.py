@@ -0,0 +1,156 @@
+from typing import Dict, List
+
+HIDDEN_CHAR = "-"
+
+# Outcomes of a guess
+CORRECT = "correct"
+WRONG = "wrong"
+ELIMINATED = "eliminated"
+WON = "won"
+
+
+class GameRuleError(Exception):
+    """Raised when a guess breaks the rules of the game."""
+
+    def __init__(self, detail: str):
+        super().__init__(detail)
+        self.detail = detail
+
+
+def validate_char(char: str):
+    """
+    Checks that a guess is a single character.
+
+    Raises:
+        GameRuleError: If the guess is not exactly one character long.
+    """
+    if len(char) != 1:
+        raise GameRuleError("Invalid parameter: char length should be 1")
+
+
+def rotate(players: list) -> list:
+    """
+    Passes the turn to the next player.
+
+    Example:
+        >>> rotate(["a", "b", "c"])
+        ['b', 'c', 'a']
+    """
+    return players[1:] + players[:1]
+
+
+def is_hit(word: str, guessed_chars, char: str) -> bool:
+    """
+    Returns:
+        bool: True if the guess reveals new characters. Guessing a character that was
+        already revealed counts as a miss.
+    """
+    return char in word and char not in guessed_chars
+
+
+def reveal(word: str, word_status: str, char: str) -> str:
+    """
+    Uncovers every occurrence of a character in the masked word.
+
+    Example:
+        >>> reveal("banana", "------", "a")
+        '-a-a-a'
+    """
+    return "".join(
+        letter if letter == char else status for letter, status in zip(word, word_status))
+
+
+class GameState:
+    """
+    The rules of a hangman game without any web framework concerns.
+
+    Players take turns in order. A correct guess reveals the character and keeps the
+    lives, any other guess costs one life. A player with no lives left is eliminated
+    and leaves the rotation. The player who completes the word wins. If every player
+    is eliminated, the game ends without a winner.
+
+    Args:
+        word (str): The word to guess.
+        player_ids (List[str]): The players in turn order.
+        max_attempts (int): Lives of every player.
+
+    Example:
+        >>> game = GameState("hund", ["alice", "bob"])
+        >>> game.guess("alice", "u"), game.word_status
+        ('correct', '-u--')
+    """
+
+    __slots__ = ("word", "word_status", "guessed_chars", "players", "lives", "max_attempts", "status", "winner")
+
+    def __init__(self, word: str, player_ids: List[str], max_attempts: int = 6):
+        self.word = word
+        self.word_status = HIDDEN_CHAR * len(word)
+        self.guessed_chars: List[str] = []
+        self.players = list(player_ids)
+        self.lives: Dict[str, int] = {}
+        self.max_attempts = max_attempts
+        self.status = "open"
+        self.winner = None
+
+    def to_dict(self) -> dict:
+        """
+        Returns:
+            dict: The state as plain JSON-compatible values, see `from_dict`.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameState":
+        """
+        Restores a state exported with `to_dict`, e.g. after moving a game to another shard.
+
+        Example:
+            >>> GameState.from_dict(GameState("hund", ["alice"]).to_dict()).word_status
+            '----'
+        """
+        game = cls.__new__(cls)
+        for name in cls.__slots__:
+            setattr(game, name, data[name])
+        return game
+
+    def guess(self, player_id: str, char: str) -> str:
+        """
+        Applies a guess of the player whose turn it is.
+
+        Args:
+            player_id (str): The guessing player.
+            char (str): The guessed character.
+
+        Returns:
+            str: CORRECT, WRONG, ELIMINATED or WON.
+
+        Raises:
+            GameRuleError: If the character is invalid, it is not the player's turn
+            or the game is over.
+        """
+        validate_char(char)
+        if self.status != "open":
+            raise GameRuleError("Game has already finished.")
+        if not self.players or player_id != self.players[0]:
+            raise GameRuleError("It's not your turn to guess.")
+
+        self.players = rotate(self.players)
+        lives = self.lives.setdefault(player_id, self.max_attempts)
+
+        if is_hit(self.word, self.guessed_chars, char):
+            self.guessed_chars.append(char)
+            self.word_status = reveal(self.word, self.word_status, char)
+            if self.word_status == self.word:
+                self.status = "finished"
+                self.winner = player_id
+                return WON
+            return CORRECT
+
+        lives -= 1
+        self.lives[player_id] = lives
+        if lives == 0:
+            self.players.remove(player_id)
+            if not self.players:
+                self.status = "finished"
+            return ELIMINATED
+        return WRONG
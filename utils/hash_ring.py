@@ -0,0 +1,68 @@
+import hashlib
+from bisect import bisect, insort
+from typing import Dict, Iterable, List
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    A consistent hash ring that assigns keys (lobby and game IDs) to named nodes.
+
+    Every node is placed on the ring `replicas` times. A key belongs to the first node
+    point after the key's hash. Adding a node only takes over the keys that fall just
+    before its points, so roughly 1/n of the keys move and all others keep their owner.
+
+    Args:
+        nodes (Iterable[str]): The initial node names.
+        replicas (int): Virtual points per node; more points spread keys more evenly.
+
+    Example:
+        >>> ring = HashRing(["shard-0", "shard-1"])
+        >>> ring.get_node("lobby1") in ("shard-0", "shard-1")
+        True
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 100):
+        self.replicas = replicas
+        self.points: List[int] = []
+        self.owners: Dict[int, str] = {}
+        self.nodes: List[str] = []
+        for node in nodes:
+            self.add_node(node)
+
+    def add_node(self, node: str):
+        """Places a node on the ring. Adding a known node is a no-op."""
+        if node in self.nodes:
+            return
+        self.nodes.append(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            self.owners[point] = node
+            insort(self.points, point)
+
+    def remove_node(self, node: str):
+        """Takes a node off the ring. Its keys move to the following nodes."""
+        if node not in self.nodes:
+            return
+        self.nodes.remove(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            if self.owners.get(point) == node:
+                del self.owners[point]
+        self.points = sorted(self.owners)
+
+    def get_node(self, key: str) -> str:
+        """
+        Returns:
+            str: The node that owns the key.
+
+        Raises:
+            LookupError: If the ring has no nodes.
+        """
+        if not self.points:
+            raise LookupError("The hash ring has no nodes.")
+        index = bisect(self.points, _hash(key)) % len(self.points)
+        return self.owners[self.points[index]]
@@ -0,0 +1,157 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Hashable, Optional
+
+PING_MESSAGE = {"type": "ping"}
+PONG_TYPE = "pong"
+
+
+class Heartbeat:
+    """Liveness bookkeeping of one connection."""
+
+    __slots__ = ("key", "last_seen", "last_active")
+
+    def __init__(self, key: Hashable, now: float):
+        self.key = key
+        self.last_seen = now
+        self.last_active = now
+
+
+class HeartbeatMonitor:
+    """
+    Server-driven heartbeats for WebSocket connections.
+
+    A single timer task pings every registered connection each `interval` seconds,
+    instead of running one task per socket. Any message received on a connection,
+    including the pong reply, marks it as alive. Connections that stay silent for
+    longer than `timeout` are evicted through the `on_evict` callback.
+
+    Args:
+        on_evict (callable): Coroutine function called with (websocket, key) for each evicted connection.
+        interval (float): Seconds between two pings.
+        timeout (float): Seconds of silence after which a connection is considered dead.
+        idle_after (float): Seconds without a non-heartbeat message after which a live connection counts as idle.
+        send_timeout (float): Seconds a single ping may take before the connection is considered dead.
+    """
+
+    def __init__(
+        self,
+        on_evict: Callable[[object, Hashable], Awaitable[None]],
+        interval: float = 10.0,
+        timeout: float = 30.0,
+        idle_after: float = 60.0,
+        send_timeout: float = 5.0,
+    ):
+        self.on_evict = on_evict
+        self.interval = interval
+        self.timeout = timeout
+        self.idle_after = idle_after
+        self.send_timeout = send_timeout
+        self.connections: Dict[object, Heartbeat] = {}
+        self.evicted = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def register(self, websocket, key: Hashable):
+        """
+        Starts tracking a connection.
+
+        Args:
+            websocket: The accepted WebSocket.
+            key (Hashable): What the connection belongs to, e.g. the lobby ID.
+        """
+        self.connections[websocket] = Heartbeat(key, time.monotonic())
+
+    def unregister(self, websocket):
+        """Stops tracking a connection. Unknown connections are ignored."""
+        self.connections.pop(websocket, None)
+
+    def touch(self, websocket, data: Optional[dict] = None) -> bool:
+        """
+        Records that a message was received on a connection.
+
+        Args:
+            websocket: The WebSocket the message was received on.
+            data (dict, optional): The decoded message, if it was JSON.
+
+        Returns:
+            bool: True if the message was a heartbeat reply that needs no further handling.
+        """
+        heartbeat = self.connections.get(websocket)
+        is_pong = isinstance(data, dict) and data.get("type") == PONG_TYPE
+        if heartbeat is not None:
+            heartbeat.last_seen = time.monotonic()
+            if not is_pong:
+                heartbeat.last_active = heartbeat.last_seen
+        return is_pong
+
+    def start(self):
+        """Starts the shared heartbeat timer on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """Stops the shared heartbeat timer."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.sweep()
+
+    async def sweep(self):
+        """Evicts silent connections and pings the remaining ones."""
+        now = time.monotonic()
+        dead, alive = [], []
+        for websocket, heartbeat in self.connections.items():
+            (dead if now - heartbeat.last_seen > self.timeout else alive).append(websocket)
+
+        results = await asyncio.gather(*(self._ping(ws) for ws in alive))
+        dead.extend(ws for ws, ok in zip(alive, results) if not ok)
+
+        for websocket in dead:
+            await self.evict(websocket)
+
+    async def evict(self, websocket):
+        """
+        Evicts a connection right away, e.g. after a failed send. Unknown connections are ignored.
+
+        Args:
+            websocket: The WebSocket to evict.
+        """
+        heartbeat = self.connections.pop(websocket, None)
+        if heartbeat is None:
+            return
+        self.evicted += 1
+        await self.on_evict(websocket, heartbeat.key)
+
+    async def _ping(self, websocket) -> bool:
+        try:
+            await asyncio.wait_for(websocket.send_json(PING_MESSAGE), self.send_timeout)
+            return True
+        except Exception:
+            return False
+
+    def stats(self) -> dict:
+        """
+        Counts connections by liveness.
+
+        Returns:
+            dict: "active" connections sent a message within `idle_after`, "idle" ones only
+            answer heartbeats, "unresponsive" ones missed at least one ping but are not
+            evicted yet, and "dead" is the total number of evicted connections.
+
+        Example:
+            {"active": 12, "idle": 3, "unresponsive": 1, "dead": 7}
+        """
+        now = time.monotonic()
+        counts = {"active": 0, "idle": 0, "unresponsive": 0, "dead": self.evicted}
+        for heartbeat in self.connections.values():
+            if now - heartbeat.last_seen > self.interval * 2:
+                counts["unresponsive"] += 1
+            elif now - heartbeat.last_active > self.idle_after:
+                counts["idle"] += 1
+            else:
+                counts["active"] += 1
+        return counts
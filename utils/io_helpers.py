@@ -1,4 +1,5 @@
 import random
+from typing import AsyncIterator, Tuple
 
 
 def get_random_word(file_path: str = "words.txt") -> str:
@@ -28,3 +29,32 @@ def get_random_word(file_path: str = "words.txt") -> str:
         raise Exception(f"The file '{file_path}' does not exist.")
     except IOError:
         raise Exception(f"Error reading the file '{file_path}'.")
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Splits a stream of byte chunks into newline-delimited lines, skipping blank lines.
+
+    Lines may span several chunks, so only the unfinished tail of a chunk is buffered.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The byte chunks, e.g. a request body stream.
+
+    Yields:
+        Tuple[int, bytes]: The 1-based line number and the line content.
+
+    Example:
+        chunks b'{"name": "Al', b'ice"}\n\n{"name": "Bob"}' yield
+        (1, b'{"name": "Alice"}') and (3, b'{"name": "Bob"}')
+    """
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        lines = (buffer + chunk).split(b"\n")
+        buffer = lines.pop()
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line
+    if buffer.strip():
+        yield number + 1, buffer
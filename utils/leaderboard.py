@@ -0,0 +1,192 @@
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from models.game_models import PlayerStatsModel
+
+
+class _Node:
+    __slots__ = ("key", "priority", "size", "left", "right")
+
+    def __init__(self, key: tuple):
+        self.key = key
+        self.priority = random.random()
+        self.size = 1
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node else 0
+
+
+def _update(node: _Node) -> _Node:
+    node.size = 1 + _size(node.left) + _size(node.right)
+    return node
+
+
+def _split(node: Optional[_Node], key: tuple) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Splits a treap into the keys lower than `key` and the keys greater or equal."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        left, right = _split(node.right, key)
+        node.right = left
+        return _update(node), right
+    left, right = _split(node.left, key)
+    node.left = right
+    return left, _update(node)
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    """Merges two treaps where every key of `left` is lower than every key of `right`."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+
+class OrderStatisticTree:
+    """
+    A treap of unique, sortable keys with subtree sizes.
+
+    Inserting, removing and ranking a key take O(log n) expected time, and the
+    first k keys are read in O(k + log n).
+
+    Example:
+        >>> tree = OrderStatisticTree()
+        >>> for key in [(3, "c"), (1, "a"), (2, "b")]:
+        ...     tree.insert(key)
+        >>> list(tree.first(2)), tree.rank((3, "c"))
+        ([(1, 'a'), (2, 'b')], 2)
+    """
+
+    def __init__(self):
+        self.root: Optional[_Node] = None
+
+    def __len__(self) -> int:
+        return _size(self.root)
+
+    def insert(self, key: tuple):
+        """Inserts a key that is not in the tree yet."""
+        left, right = _split(self.root, key)
+        self.root = _merge(_merge(left, _Node(key)), right)
+
+    def remove(self, key: tuple):
+        """Removes a key. Missing keys are ignored."""
+        left, right = _split(self.root, key)
+        _, right = _split(right, key + (1,))
+        self.root = _merge(left, right)
+
+    def rank(self, key: tuple) -> int:
+        """
+        Returns:
+            int: The number of keys lower than `key`, i.e. its 0-based position.
+        """
+        rank = 0
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                rank += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return rank
+
+    def first(self, k: int) -> Iterator[tuple]:
+        """Yields the k lowest keys in order."""
+        stack: List[_Node] = []
+        node = self.root
+        while k > 0 and (stack or node is not None):
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            k -= 1
+            node = node.right
+
+
+class Leaderboard:
+    """
+    Per-player statistics with a ranking that is updated as games finish.
+
+    Players are ranked by wins (most first), then by games played (fewest first).
+    The ranking key only changes when a game ends for a player, so a single guess
+    costs O(1) and a finished game O(log n) per player.
+    """
+
+    def __init__(self):
+        self.stats: Dict[str, PlayerStatsModel] = {}
+        self.ranking = OrderStatisticTree()
+
+    @staticmethod
+    def _key(stats: PlayerStatsModel) -> tuple:
+        return (-stats.wins, stats.games_played, stats.player_id)
+
+    def get_stats(self, player_id: str, name: str = "") -> PlayerStatsModel:
+        """
+        Returns the statistics of a player, creating empty ones on first use.
+
+        Args:
+            player_id (str): The ID of the player.
+            name (str): The name of the player, stored so lookups never scan the player list.
+
+        Returns:
+            PlayerStatsModel: The statistics of the player.
+        """
+        stats = self.stats.get(player_id)
+        if stats is None:
+            stats = PlayerStatsModel(player_id=player_id, name=name)
+            self.stats[player_id] = stats
+            self.ranking.insert(self._key(stats))
+        return stats
+
+    def record_guess(self, player_id: str, name: str, correct: bool):
+        """
+        Counts a guess of a player.
+
+        Args:
+            player_id (str): The ID of the player.
+            name (str): The name of the player.
+            correct (bool): Whether the guess revealed a character.
+        """
+        stats = self.get_stats(player_id, name)
+        stats.guesses += 1
+        if correct:
+            stats.correct_guesses += 1
+        stats.accuracy = stats.correct_guesses / stats.guesses
+
+    def record_game_end(self, player_id: str, name: str, won: bool):
+        """
+        Counts a game that ended for a player and moves the player in the ranking.
+
+        Args:
+            player_id (str): The ID of the player.
+            name (str): The name of the player.
+            won (bool): Whether the player won the game.
+        """
+        stats = self.get_stats(player_id, name)
+        self.ranking.remove(self._key(stats))
+        stats.games_played += 1
+        if won:
+            stats.wins += 1
+        self.ranking.insert(self._key(stats))
+
+    def rank(self, player_id: str) -> int:
+        """
+        Returns:
+            int: The 1-based rank of a known player.
+        """
+        return self.ranking.rank(self._key(self.stats[player_id])) + 1
+
+    def top(self, k: int) -> List[PlayerStatsModel]:
+        """
+        Returns:
+            List[PlayerStatsModel]: The statistics of the k best players, best first.
+        """
+        return [self.stats[key[2]] for key in self.ranking.first(k)]
@@ -0,0 +1,153 @@
+import random
+import sys
+import tracemalloc
+from collections import OrderedDict
+from itertools import islice
+
+from pydantic import BaseModel
+
+# Objects of other types (e.g. WebSockets) are counted shallowly, as following their
+# references would measure the whole application they point to.
+CONTAINERS = (list, tuple, set, frozenset, dict)
+SCALARS = (str, bytes, int, float, bool, type(None))
+
+
+def deep_sizeof(obj, seen: set = None) -> int:
+    """
+    Estimates the bytes used by an object and everything it holds.
+
+    Containers, pydantic models, objects with __slots__ and their contents are followed;
+    shared objects are counted once. Any other object only counts its own size.
+
+    Args:
+        obj: The object to measure.
+        seen (set, optional): IDs of objects already counted.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, SCALARS):
+        return size
+    if isinstance(obj, dict):
+        return size + sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    if isinstance(obj, CONTAINERS):
+        return size + sum(deep_sizeof(item, seen) for item in obj)
+    if isinstance(obj, BaseModel):
+        return size + deep_sizeof(obj.__dict__, seen) + deep_sizeof(obj.__fields_set__, seen)
+    if hasattr(type(obj), "__slots__"):
+        return size + sum(deep_sizeof(getattr(obj, name, None), seen) for name in type(obj).__slots__)
+    return size
+
+
+def estimate_collection(collection, sample_size: int = 100, rng: random.Random = None) -> dict:
+    """
+    Estimates the deep size of a list or dict from a random sample of its items.
+
+    Measuring every item would touch the whole state on each call, so only
+    `sample_size` items are measured and the average is scaled to the full length.
+
+    Args:
+        collection (list | dict): The collection to measure.
+        sample_size (int): Number of items to measure.
+        rng (random.Random, optional): Random source for the sample.
+
+    Returns:
+        dict: The item count, the estimated deep size in bytes and the number of sampled items.
+
+    Example:
+        {"count": 1200, "bytes": 1843200, "sampled": 100}
+    """
+    rng = rng or random
+    count = len(collection)
+    size = sys.getsizeof(collection)
+    if count == 0:
+        return {"count": 0, "bytes": size, "sampled": 0}
+
+    sampled = min(sample_size, count)
+    if isinstance(collection, dict):
+        # Sample from a random window so large dicts are not copied into a list
+        start = rng.randrange(count - sampled + 1)
+        items = list(islice(collection.items(), start, start + sampled))
+    else:
+        items = [collection[i] for i in rng.sample(range(count), sampled)]
+
+    sample_bytes = sum(deep_sizeof(item) - (sys.getsizeof(item) if isinstance(item, tuple) else 0)
+                       for item in items)
+    return {"count": count, "bytes": size + sample_bytes * count // sampled, "sampled": sampled}
+
+
+class AllocationTracker:
+    """
+    On-demand tracemalloc snapshots with their top allocation sites and diffs.
+
+    Tracing is started with the first snapshot, since it slows down every allocation.
+    Only the last `max_snapshots` snapshots are kept.
+
+    Args:
+        max_snapshots (int): Number of snapshots kept.
+        frames (int): Stack frames stored per allocation.
+    """
+
+    def __init__(self, max_snapshots: int = 5, frames: int = 1):
+        self.max_snapshots = max_snapshots
+        self.frames = frames
+        self.snapshots: "OrderedDict[int, tracemalloc.Snapshot]" = OrderedDict()
+        self.next_id = 1
+
+    def take(self) -> int:
+        """
+        Takes a snapshot, starting tracing if needed.
+
+        Returns:
+            int: The ID of the snapshot.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        snapshot_id = self.next_id
+        self.next_id += 1
+        self.snapshots[snapshot_id] = snapshot
+        if len(self.snapshots) > self.max_snapshots:
+            self.snapshots.popitem(last=False)
+        return snapshot_id
+
+    def stop(self):
+        """Stops tracing and drops the snapshots."""
+        tracemalloc.stop()
+        self.snapshots.clear()
+
+    def top(self, snapshot_id: int, limit: int = 10) -> list:
+        """
+        Returns:
+            list: The allocation sites of a snapshot using the most memory.
+
+        Raises:
+            KeyError: If the snapshot does not exist.
+        """
+        stats = self.snapshots[snapshot_id].statistics("lineno")[:limit]
+        return [{"site": str(stat.traceback), "bytes": stat.size, "count": stat.count} for stat in stats]
+
+    def diff(self, from_id: int, to_id: int, limit: int = 10) -> list:
+        """
+        Returns:
+            list: The allocation sites whose memory grew or shrank the most between two snapshots.
+
+        Raises:
+            KeyError: If a snapshot does not exist.
+        """
+        stats = self.snapshots[to_id].compare_to(self.snapshots[from_id], "lineno")[:limit]
+        return [
+            {"site": str(stat.traceback), "bytes": stat.size, "bytes_diff": stat.size_diff,
+             "count": stat.count, "count_diff": stat.count_diff}
+            for stat in stats
+        ]
@@ -0,0 +1,130 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+
+class TokenBucket:
+    """
+    State of a single token bucket. Its refill rate and capacity live on the RateLimiter.
+    """
+
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, capacity: float, now: float):
+        self.tokens = capacity
+        self.updated = now
+
+
+class RateLimiter:
+    """
+    Token buckets keyed by an identifier (player ID, client IP, ...) or a tuple of them.
+
+    The buckets live in a bounded LRU, so a flood of distinct keys evicts the least
+    recently seen ones instead of growing memory without limit. An evicted key simply
+    starts again with a full bucket.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum burst size.
+        max_keys (int): Maximum number of buckets kept.
+
+    Example:
+        >>> limiter = RateLimiter(rate=1, capacity=2)
+        >>> limiter.hit("player1"), limiter.hit("player1"), limiter.hit("player1") > 0
+        (0.0, 0.0, True)
+    """
+
+    def __init__(self, rate: float, capacity: float, max_keys: int = 10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    def hit(self, key: Hashable, cost: float = 1.0, now: Optional[float] = None) -> float:
+        """
+        Takes `cost` tokens from the bucket of `key`.
+
+        Args:
+            key (Hashable): The identifier to rate limit, e.g. a player ID or a (client IP, player ID) tuple.
+            cost (float): Number of tokens the request costs.
+            now (float, optional): Current monotonic time, mainly for testing.
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the seconds to wait before retrying.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self.capacity, now)
+            self.buckets[key] = bucket
+            if len(self.buckets) > self.max_keys:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+            bucket.tokens = min(
+                self.capacity, bucket.tokens + (now - bucket.updated) * self.rate)
+            bucket.updated = now
+
+        if bucket.tokens >= cost:
+            bucket.tokens -= cost
+            return 0.0
+
+        return (cost - bucket.tokens) / self.rate
+
+
+class LoadMonitor:
+    """
+    Tracks in-flight requests and event-loop lag to decide when to shed load.
+
+    The lag is measured by a background task that sleeps for `interval` seconds and
+    records how late it woke up. A busy loop wakes up late, so the lag grows with load.
+
+    Args:
+        max_in_flight (int): In-flight request count above which the server is overloaded.
+        max_lag (float): Event-loop lag in seconds above which the server is overloaded.
+        interval (float): Seconds between two lag measurements.
+    """
+
+    def __init__(self, max_in_flight: int = 500, max_lag: float = 0.2, interval: float = 0.1):
+        self.max_in_flight = max_in_flight
+        self.max_lag = max_lag
+        self.interval = interval
+        self.in_flight = 0
+        self.lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Starts measuring event-loop lag on the running loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._measure_lag())
+
+    def stop(self):
+        """Stops measuring event-loop lag."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _measure_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - start - self.interval)
+
+    def overloaded(self) -> bool:
+        """
+        Returns:
+            bool: True if requests should be shed right now.
+        """
+        return self.in_flight >= self.max_in_flight or self.lag > self.max_lag
+
+    def retry_after(self) -> int:
+        """
+        Returns:
+            int: Suggested seconds before a shed client retries.
+        """
+        return max(1, math.ceil(self.lag))
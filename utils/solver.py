@@ -0,0 +1,307 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+HIDDEN_CHAR = "-"
+
+
+# Candidate sets larger than this are counted with popcounts over the whole bucket;
+# smaller ones only gather their own columns.
+DENSE_COUNT_MIN = 2048
+
+# Constants of the SWAR popcount over uint64 words
+_M1 = np.uint64(0x5555555555555555)
+_M2 = np.uint64(0x3333333333333333)
+_M4 = np.uint64(0x0F0F0F0F0F0F0F0F)
+_H01 = np.uint64(0x0101010101010101)
+
+# Position masks are stored in the smallest unsigned type with a bit per position.
+# Longer words are left out of the corpus.
+MAX_WORD_LENGTH = 64
+
+
+def _position_dtype(length: int):
+    for dtype in (np.uint8, np.uint16, np.uint32, np.uint64):
+        if length <= np.iinfo(dtype).bits:
+            return dtype
+    raise ValueError(f"Words longer than {MAX_WORD_LENGTH} characters are not supported")
+
+
+def _pack_bits(matrix: np.ndarray) -> np.ndarray:
+    """Packs the last axis of a boolean array into uint64 words, padding with zeros."""
+    padding = -matrix.shape[-1] % 64
+    if padding:
+        matrix = np.pad(matrix, [(0, 0)] * (matrix.ndim - 1) + [(0, padding)])
+    return np.packbits(matrix, axis=-1, bitorder="little").view(np.uint64)
+
+
+def _popcount(words: np.ndarray) -> np.ndarray:
+    """Counts the set bits of every uint64 (numpy has no popcount before 2.0)."""
+    words = words - ((words >> np.uint64(1)) & _M1)
+    words = (words & _M2) + ((words >> np.uint64(2)) & _M2)
+    words = (words + (words >> np.uint64(4))) & _M4
+    return (words * _H01) >> np.uint64(56)
+
+
+class WordBucket:
+    """
+    Precomputed matrices for all corpus words of a single length.
+
+    Attributes:
+        words (List[str]): The words in this bucket.
+        positions (np.ndarray): (n_letters, n_words) matrix with a bit per position at
+            which the letter occurs in the word. A row is contiguous, so checking a letter
+            against the revealed positions is a single vectorized comparison.
+        presence (np.ndarray): (n_letters, n_words / 64) letter x word matrix packed into
+            uint64 bits, so letter counts over a candidate set are an AND and a popcount.
+        base_counts (np.ndarray): Letter frequency over the whole bucket, cached for the first move.
+    """
+
+    def __init__(self, words: List[str], alphabet_index: Dict[str, int]):
+        self.words = words
+        length = len(words[0])
+        columns = np.arange(len(words))
+        self.positions = np.zeros((len(alphabet_index), len(words)), dtype=_position_dtype(length))
+        for position in range(length):
+            codes = np.fromiter((alphabet_index[word[position]] for word in words),
+                                dtype=np.intp, count=len(words))
+            self.positions[codes, columns] |= self.positions.dtype.type(1 << position)
+        self.presence = _pack_bits(self.positions != 0)
+        self.base_counts = np.count_nonzero(self.positions, axis=1).astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def keep_vector(self, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: A boolean vector over the bucket, True for the candidates (all
+            words if None). It is padded to a multiple of 64 so it packs without a copy.
+        """
+        keep = np.zeros(len(self) + -len(self) % 64, dtype=bool)
+        if candidates is None:
+            keep[:len(self)] = True
+        else:
+            keep[candidates] = True
+        return keep
+
+    def count_letters(self, candidates: np.ndarray, keep: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Counts in how many candidate words each letter occurs.
+
+        Args:
+            candidates (np.ndarray): Indices of the candidate words.
+            keep (np.ndarray, optional): The same candidates as returned by keep_vector.
+
+        Returns:
+            np.ndarray: The count per letter.
+        """
+        if len(candidates) >= DENSE_COUNT_MIN:
+            if keep is None:
+                keep = self.keep_vector(candidates)
+            return _popcount(self.presence & _pack_bits(keep)).sum(axis=1, dtype=np.int64)
+        return np.count_nonzero(self.positions[:, candidates], axis=1).astype(np.int64)
+
+
+class HangmanSolver:
+    """
+    Picks hangman guesses by letter frequency over the words still consistent with the game.
+
+    The corpus is split into buckets by word length. For every letter, a bucket stores
+    the positions it occurs at as a bit mask per word. A word is consistent with the game
+    if, for every tried letter, its mask equals the positions revealed for that letter
+    (none for a miss), so filtering is one comparison per tried letter and counting is
+    a popcount over bit-packed rows, instead of Python loops over the word list.
+
+    Example:
+        >>> solver = HangmanSolver(["haus", "hund", "maus"])
+        >>> char, candidates = solver.next_guess("h---", ["h"])
+        >>> char
+        'u'
+    """
+
+    def __init__(self, words: Iterable[str]):
+        words = sorted({word for word in words if word and len(word) <= MAX_WORD_LENGTH})
+        self.alphabet = sorted({char for word in words for char in word})
+        self.alphabet_index = {char: i for i, char in enumerate(self.alphabet)}
+
+        by_length: Dict[int, List[str]] = {}
+        for word in words:
+            by_length.setdefault(len(word), []).append(word)
+
+        self.buckets = {
+            length: WordBucket(bucket_words, self.alphabet_index)
+            for length, bucket_words in by_length.items()
+        }
+        self.fallback_counts = np.zeros(len(self.alphabet), dtype=np.int64)
+        for bucket in self.buckets.values():
+            self.fallback_counts += bucket.base_counts
+
+    @classmethod
+    def from_file(cls, file_path: str = "words.txt") -> "HangmanSolver":
+        """
+        Builds a solver from a word list file with one word per line.
+
+        Args:
+            file_path (str): Path to the word list. Default is 'words.txt'.
+
+        Returns:
+            HangmanSolver: A solver over the words in the file.
+        """
+        with open(file_path, "r") as file:
+            return cls(file.read().splitlines())
+
+    def _constraints(self, word_status: str, guessed_chars: Iterable[str],
+                     missed_chars: Iterable[str]) -> Optional[Dict[int, int]]:
+        # Maps every tried letter to the position mask a consistent word must have for it
+        expected = {}
+        for position, char in enumerate(word_status):
+            if char == HIDDEN_CHAR:
+                continue
+            if char not in self.alphabet_index:
+                return None
+            code = self.alphabet_index[char]
+            expected[code] = expected.get(code, 0) | (1 << position)
+        for char in list(guessed_chars) + list(missed_chars):
+            if char in self.alphabet_index:
+                expected.setdefault(self.alphabet_index[char], 0)
+        return expected
+
+    def _filter(self, bucket: WordBucket, expected: Dict[int, int],
+                candidates: Optional[np.ndarray]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        dtype = bucket.positions.dtype.type
+        if candidates is None or len(candidates) * 4 > len(bucket):
+            # Large sets: compare whole contiguous rows into one keep vector
+            keep = bucket.keep_vector(candidates)
+            view = keep[:len(bucket)]
+            for code, mask in expected.items():
+                view &= bucket.positions[code] == dtype(mask)
+            return np.flatnonzero(keep), keep
+
+        # Small sets: only gather the candidates' columns
+        keep = np.ones(len(candidates), dtype=bool)
+        for code, mask in expected.items():
+            keep &= bucket.positions[code, candidates] == dtype(mask)
+        return candidates[keep], None
+
+    def filter_candidates(
+        self,
+        word_status: str,
+        guessed_chars: Iterable[str],
+        missed_chars: Iterable[str] = (),
+        candidates: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Narrows the candidate words down to the ones consistent with the game state.
+
+        A word is consistent if it matches every revealed position, has none of the
+        guessed characters in a hidden position, and contains none of the missed characters.
+
+        Args:
+            word_status (str): The masked word, hidden positions marked with '-'.
+            guessed_chars (Iterable[str]): Characters that were guessed correctly.
+            missed_chars (Iterable[str]): Characters known to be absent from the word.
+            candidates (np.ndarray, optional): Row indices from a previous call to narrow further.
+
+        Returns:
+            np.ndarray: Word indices into the bucket for the word length.
+        """
+        bucket = self.buckets.get(len(word_status))
+        expected = self._constraints(word_status, guessed_chars, missed_chars)
+        if bucket is None or expected is None:
+            return np.empty(0, dtype=np.intp)
+        return self._filter(bucket, expected, candidates)[0]
+
+    def next_guess(
+        self,
+        word_status: str,
+        guessed_chars: Iterable[str],
+        missed_chars: Iterable[str] = (),
+        candidates: Optional[np.ndarray] = None,
+    ) -> Tuple[Optional[str], np.ndarray]:
+        """
+        Chooses the untried letter that occurs in the most remaining candidate words.
+
+        Args:
+            word_status (str): The masked word, hidden positions marked with '-'.
+            guessed_chars (Iterable[str]): Characters that were guessed correctly.
+            missed_chars (Iterable[str]): Characters known to be absent from the word.
+            candidates (np.ndarray, optional): Candidates from the previous move, if any.
+
+        Returns:
+            Tuple[Optional[str], np.ndarray]: The letter to guess (None if every letter
+            has been tried) and the narrowed candidate indices to pass to the next call.
+        """
+        guessed_chars = list(guessed_chars)
+        missed_chars = list(missed_chars)
+        bucket = self.buckets.get(len(word_status))
+        expected = self._constraints(word_status, guessed_chars, missed_chars)
+
+        if bucket is not None and candidates is None and not expected:
+            # Nothing is known yet: reuse the cached counts of the whole bucket
+            candidates = np.arange(len(bucket))
+            counts = bucket.base_counts.copy()
+        else:
+            keep = None
+            if bucket is None or expected is None:
+                candidates = np.empty(0, dtype=np.intp)
+            else:
+                candidates, keep = self._filter(bucket, expected, candidates)
+            if len(candidates):
+                counts = bucket.count_letters(candidates, keep)
+            else:
+                # The word is not in our corpus, fall back to overall letter frequency
+                counts = self.fallback_counts.copy()
+
+        tried = self._to_codes(guessed_chars + missed_chars)
+        counts[tried] = -1
+        best = int(np.argmax(counts))
+        if counts[best] < 0:
+            return None, candidates
+        return self.alphabet[best], candidates
+
+    def _to_codes(self, chars: Iterable[str]) -> np.ndarray:
+        return np.array(
+            [self.alphabet_index[char] for char in chars if char in self.alphabet_index],
+            dtype=np.intp,
+        )
+
+
+class BotPlayer:
+    """
+    Per-game solver state of a bot player.
+
+    Wrong guesses are not recorded on the GameModel, so the bot remembers its own
+    misses and the candidate set it narrowed down on its previous move.
+    """
+
+    def __init__(self, solver: HangmanSolver):
+        self.solver = solver
+        self.missed_chars: List[str] = []
+        self.candidates: Optional[np.ndarray] = None
+
+    def choose(self, word_status: str, guessed_chars: List[str]) -> Optional[str]:
+        """
+        Picks the next character for the given game state.
+
+        Args:
+            word_status (str): The masked word, hidden positions marked with '-'.
+            guessed_chars (List[str]): Characters that were guessed correctly so far.
+
+        Returns:
+            Optional[str]: The character to guess, or None if nothing is left to try.
+        """
+        char, self.candidates = self.solver.next_guess(
+            word_status, guessed_chars, self.missed_chars, self.candidates)
+        return char
+
+    def record(self, char: str, guessed_chars: List[str]):
+        """
+        Remembers a guess as missed if it did not end up among the guessed characters.
+
+        Args:
+            char (str): The character that was guessed.
+            guessed_chars (List[str]): The game's guessed characters after the guess.
+        """
+        if char not in guessed_chars:
+            self.missed_chars.append(char)
@@ -0,0 +1,146 @@
+import asyncio
+import json
+from collections import deque
+from typing import AsyncIterator, Callable, Optional, Set, Tuple
+
+
+def encode_event(event_id: int, event: str, data) -> bytes:
+    """
+    Encodes one Server-Sent Event.
+
+    Example:
+        >>> encode_event(3, "created", {"id": "lobby1"})
+        b'id: 3\\nevent: created\\ndata: {"id": "lobby1"}\\n\\n'
+    """
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode()
+
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+async def read_events(lines: AsyncIterator[bytes]) -> AsyncIterator[Tuple[Optional[str], str, object]]:
+    """
+    Decodes a stream of Server-Sent Events as written by `encode_event`.
+
+    Comments such as keepalives are skipped.
+
+    Args:
+        lines (AsyncIterator[bytes]): The lines of the stream, e.g. an aiohttp response's content.
+
+    Yields:
+        tuple: The ID, the event name and the JSON decoded data of every event.
+    """
+    event_id, event, data = None, "message", []
+    async for line in lines:
+        line = line.decode().rstrip("\r\n")
+        if not line:
+            if data:
+                yield event_id, event, json.loads("\n".join(data))
+            event, data = "message", []
+            continue
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "id":
+            event_id = value
+        elif field == "event":
+            event = value
+        elif field == "data":
+            data.append(value)
+
+
+class EventStream:
+    """
+    Fans Server-Sent Events out to many subscribers.
+
+    Every event is encoded once and the same bytes are queued for every subscriber.
+    Each subscriber has a bounded queue: a subscriber that falls behind is dropped and
+    can reconnect with Last-Event-ID. The last `history` events are kept, so a client
+    that reconnects within that window receives only what it missed; older clients get
+    a fresh snapshot instead.
+
+    Args:
+        snapshot (callable): Returns the data of the snapshot event sent to new clients.
+        history (int): Number of recent events kept for resuming clients.
+        buffer (int): Maximum number of queued events per subscriber.
+        keepalive (float): Seconds of silence after which a comment is sent to keep the connection open.
+    """
+
+    def __init__(self, snapshot: Callable[[], object], history: int = 1000, buffer: int = 100,
+                 keepalive: float = 15.0):
+        self.snapshot = snapshot
+        self.buffer = buffer
+        self.keepalive = keepalive
+        self.last_id = 0
+        self.recent = deque(maxlen=history)
+        self.subscribers: Set[asyncio.Queue] = set()
+        self._snapshot_cache = None
+
+    def publish(self, event: str, data):
+        """
+        Encodes an event once and queues it for every subscriber.
+
+        Args:
+            event (str): The SSE event name.
+            data: JSON serializable event data.
+        """
+        self.last_id += 1
+        encoded = encode_event(self.last_id, event, data)
+        self.recent.append((self.last_id, encoded))
+
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(encoded)
+            except asyncio.QueueFull:
+                # Too slow: end its stream, the client resumes from its last event ID
+                self.subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def _encoded_snapshot(self) -> bytes:
+        # The snapshot only changes with the next event, so concurrent connects share it
+        if self._snapshot_cache is None or self._snapshot_cache[0] != self.last_id:
+            self._snapshot_cache = (self.last_id, encode_event(self.last_id, "snapshot", self.snapshot()))
+        return self._snapshot_cache[1]
+
+    def _missed_since(self, last_event_id: Optional[str]) -> Optional[list]:
+        if last_event_id is None or not last_event_id.isdigit():
+            return None
+        last_event_id = int(last_event_id)
+        if last_event_id == self.last_id:
+            return []
+        if not self.recent or last_event_id < self.recent[0][0] - 1 or last_event_id > self.last_id:
+            return None
+        return [encoded for event_id, encoded in self.recent if event_id > last_event_id]
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[bytes]:
+        """
+        Streams encoded events to one client.
+
+        Args:
+            last_event_id (str, optional): The Last-Event-ID header of a reconnecting client.
+
+        Yields:
+            bytes: The missed events or a snapshot, then every new event as it is published.
+        """
+        queue = asyncio.Queue(self.buffer)
+        self.subscribers.add(queue)
+        try:
+            missed = self._missed_since(last_event_id)
+            if missed is None:
+                yield self._encoded_snapshot()
+            else:
+                for encoded in missed:
+                    yield encoded
+
+            while True:
+                try:
+                    encoded = await asyncio.wait_for(queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE
+                    continue
+                if encoded is None:
+                    return
+                yield encoded
+        finally:
+            self.subscribers.discard(queue)
@@ -0,0 +1,124 @@
+from typing import Dict, Hashable, Iterable, Set
+
+# Prefixes of the topics a multiplexed connection can subscribe to
+TOPIC_KINDS = ("lobby", "game")
+
+
+def lobby_topic(lobby_id: str) -> str:
+    return f"lobby:{lobby_id}"
+
+
+def game_topic(game_id: str) -> str:
+    return f"game:{game_id}"
+
+
+def parse_topic(topic) -> tuple | None:
+    """
+    Splits a topic into its kind and ID.
+
+    Returns:
+        tuple | None: The kind and the ID, or None if the topic is malformed.
+
+    Example:
+        >>> parse_topic("game:abc")
+        ('game', 'abc')
+    """
+    if not isinstance(topic, str):
+        return None
+    kind, _, key = topic.partition(":")
+    if kind not in TOPIC_KINDS or not key:
+        return None
+    return kind, key
+
+
+class TopicRegistry:
+    """
+    Which connections are subscribed to which topics, indexed both ways.
+
+    Publishing looks up the subscribers of a topic, closing a connection drops all its
+    topics, so both directions are kept in sync instead of scanning either side.
+
+    Args:
+        max_topics (int): Maximum number of topics per connection.
+
+    Example:
+        >>> registry = TopicRegistry()
+        >>> registry.subscribe("ws1", "lobby:abc")
+        True
+        >>> registry.get("lobby:abc")
+        {'ws1'}
+    """
+
+    def __init__(self, max_topics: int = 1000):
+        self.max_topics = max_topics
+        self.subscribers: Dict[str, Set[Hashable]] = {}
+        self.topics: Dict[Hashable, Set[str]] = {}
+
+    def subscribe(self, connection: Hashable, topic: str) -> bool:
+        """
+        Subscribes a connection to a topic. Subscribing twice is a no-op.
+
+        Returns:
+            bool: False if the connection already holds `max_topics` other topics.
+        """
+        topics = self.topics.setdefault(connection, set())
+        if topic not in topics and len(topics) >= self.max_topics:
+            return False
+        topics.add(topic)
+        self.subscribers.setdefault(topic, set()).add(connection)
+        return True
+
+    def unsubscribe(self, connection: Hashable, topic: str):
+        """Unsubscribes a connection from a topic. Unknown topics are ignored."""
+        topics = self.topics.get(connection)
+        if topics is not None:
+            topics.discard(topic)
+        subscribers = self.subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.discard(connection)
+            if not subscribers:
+                del self.subscribers[topic]
+
+    def remove(self, connection: Hashable):
+        """Unsubscribes a connection from all its topics."""
+        for topic in self.topics.pop(connection, ()):
+            subscribers = self.subscribers[topic]
+            subscribers.discard(connection)
+            if not subscribers:
+                del self.subscribers[topic]
+
+    def get(self, topic: str) -> Set[Hashable]:
+        """
+        Returns:
+            Set: The connections subscribed to a topic. Do not modify it.
+        """
+        return self.subscribers.get(topic, set())
+
+    def recipients(self, topics: Iterable[str]) -> Dict[str, list]:
+        """
+        Assigns every connection subscribed to any of the topics to the first one it matches.
+
+        A connection following both a lobby and its game receives each event once.
+
+        Returns:
+            dict: The connections to send to, per topic the event is tagged with.
+        """
+        seen = set()
+        result = {}
+        for topic in topics:
+            connections = [connection for connection in self.get(topic) if connection not in seen]
+            if connections:
+                seen.update(connections)
+                result[topic] = connections
+        return result
+
+    def stats(self) -> dict:
+        """
+        Example:
+            {"connections": 3, "topics": 120, "subscriptions": 150}
+        """
+        return {
+            "connections": len(self.topics),
+            "topics": len(self.subscribers),
+            "subscriptions": sum(len(topics) for topics in self.topics.values()),
+        }